@@ -7,6 +7,7 @@ from google.ai.generativelanguage_v1beta.types import Tool as GenAITool
 from portfolio_analysis_tools.report_generator import generate_portfolio_report
 
 from portfolio_management_tools.database_add import add_to_database
+from portfolio_management_tools.database_bulk_import import bulk_import_to_database
 from portfolio_management_tools.database_update import update_database
 from portfolio_management_tools.database_list import list_database
 from portfolio_management_tools.database_clear import clear_database
@@ -81,7 +82,7 @@ def parse_user_input(state):
 
     user_input = state["messages"][-1]
 
-    tools = [generate_portfolio_report, add_to_database, update_database, list_database, clear_database, get_by_trans, get_database_by_name, delete_database_by_name, delete_database_by_trans, get_sector_industry_recommendation, specific_stock_analysis, screen_stocks, get_financial_news, display_result_for_unknown_prompts]
+    tools = [generate_portfolio_report, add_to_database, bulk_import_to_database, update_database, list_database, clear_database, get_by_trans, get_database_by_name, delete_database_by_name, delete_database_by_trans, get_sector_industry_recommendation, specific_stock_analysis, screen_stocks, get_financial_news, display_result_for_unknown_prompts]
 
     llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", transport="rest")
     llm_with_tools = llm.bind_tools(tools)
@@ -160,6 +161,14 @@ def parse_user_input(state):
                     "price": "float"
                 }
             },
+            {
+                "tool_name": "bulk_import_to_database",
+                "description": "Import many holdings at once from a broker export file (CSV or JSON).",
+                "triggers": ["import", "upload", "load my broker statement", "import holdings from file"],
+                "parameters": {
+                    "file_path": "string"
+                }
+            },
             {
                 "tool_name": "clear_database",
                 "description": "Clear all holdings from the user's account.",
@@ -173,9 +182,9 @@ def parse_user_input(state):
             },
             {
                 "tool_name": "delete_database_by_trans",
-                "description": "Delete a holding using a transaction ID.",
+                "description": "Delete one or more holdings using their transaction IDs.",
                 "triggers": ["delete transaction", "remove transaction", "cancel tx"],
-                "parameters": { "transaction_id": "string" }
+                "parameters": { "transaction_ids": "list[string]" }
             },
             {
                 "tool_name": "get_by_trans",
@@ -196,12 +205,10 @@ def parse_user_input(state):
             },
             {
                 "tool_name": "update_database",
-                "description": "Update a particular holding in the user's account using its transaction ID.",
+                "description": "Update one or more holdings in the user's account using their transaction IDs.",
                 "triggers": ["update", "change", "modify"],
                 "parameters": {
-                    "transaction_id": "string",
-                    "new_quantity": "integer (optional)",
-                    "new_price": "float (optional)"
+                    "updates": "list[{transaction_id: string, new_quantity: integer (optional), new_price: float (optional)}]"
                 }
             }
         ],
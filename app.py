@@ -51,8 +51,15 @@ if "thread_id" not in st.session_state:
     st.session_state.thread_id = 1 # Use a consistent thread_id for the session
 
 # --- 3. Settings File Handling ---
-# This path now matches your project structure
-SETTINGS_FILE_PATH = Path("Database/settings.json")
+# Each portfolio keeps its own settings; pick one with ?portfolio=<id> in the URL
+try:
+    from functions.portfolios import DEFAULT_PORTFOLIO_ID, portfolio_file, validate_portfolio_id
+    PORTFOLIO_ID = validate_portfolio_id(st.query_params.get("portfolio", DEFAULT_PORTFOLIO_ID))
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+
+SETTINGS_FILE_PATH = Path(portfolio_file(PORTFOLIO_ID, "settings.json"))
 
 def load_settings():
     """Load settings from JSON file into session state."""
@@ -197,7 +204,7 @@ else:
                 try:
                     # --- CHANGE 3: Use .stream() instead of .invoke() ---
                     events = graph.stream(
-                        {"messages": [{"role": "user", "content": prompt}], "user_profile": st.session_state.user_profile},
+                        {"messages": [{"role": "user", "content": prompt}], "user_profile": st.session_state.user_profile, "portfolio_id": PORTFOLIO_ID},
                         config={"configurable": {"thread_id": st.session_state.thread_id}}
                     )
                     
@@ -0,0 +1,54 @@
+"""
+Times supervisor_agent.graph end to end on a list of prompts, with every Yahoo and Gemini
+call answered from a cassette (see functions/cassette.py), so it runs without network.
+
+    python -m benchmarks.bench_graph record <cassette> "prompt" ["prompt" ...]
+    python -m benchmarks.bench_graph replay <cassette> "prompt" ["prompt" ...] [--latency=recorded|<seconds>]
+
+Record once with network access, then replay anywhere. The on-disk caches under
+Database/ (price history, fundamentals, symbol index) are used in both modes; record
+from the same cache state the replay will start from. Tools that ask for confirmation
+read it from stdin, e.g. `yes y | python -m benchmarks.bench_graph replay ...`.
+"""
+import sys
+import time
+
+from functions.cassette import Cassette
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
+
+USER_PROFILE = {
+    "name": "Benchmark",
+    "age": "35",
+    "risk_tolerance": "moderate",
+    "investment_horizon": "Long-term (7+ years)"
+}
+
+
+def run_prompts(prompts):
+    # Imported after the cassette is installed, so nothing reaches the network on import either.
+    from supervisor_agent import graph
+
+    timings = []
+    for prompt in prompts:
+        start = time.perf_counter()
+        graph.invoke(
+            {"messages": [{"role": "user", "content": prompt}], "user_profile": USER_PROFILE, "portfolio_id": DEFAULT_PORTFOLIO_ID},
+            config={"configurable": {"thread_id": 1}}
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main(mode: str, path: str, prompts, latency: str="recorded"):
+    with Cassette(path, mode, latency):
+        timings = run_prompts(prompts)
+
+    for prompt, seconds in zip(prompts, timings):
+        print(f"{seconds * 1000:10.1f} ms  {prompt}")
+    print(f"{sum(timings) * 1000:10.1f} ms  total ({mode}, latency={latency})")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--latency=")]
+    latency = next((arg.split("=", 1)[1] for arg in sys.argv[1:] if arg.startswith("--latency=")), "recorded")
+    main(args[0], args[1], args[2:], latency)
@@ -0,0 +1,94 @@
+"""
+Benchmarks the valuation step of the PDF report (tools/generate_report.perform_analysis)
+against the previous row-by-row implementation, on a synthetic portfolio.
+
+    python -m benchmarks.bench_perform_analysis [positions] [repeats]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from functions import fx
+from tools.generate_report import perform_analysis
+
+CURRENCIES = ["USD", "INR", "EUR", "GBP", "JPY", "HKD", "CAD", "AUD"]
+SECTORS = ["technology", "healthcare", "financial-services", "energy", "industrials", "utilities"]
+
+
+def make_portfolio(n_positions: int, seed: int=0):
+    rng = np.random.default_rng(seed)
+    tickers = [f"SYM{i:05d}" for i in range(n_positions)]
+    quantity = rng.integers(1, 500, n_positions).astype(float)
+
+    df = pd.DataFrame({
+        "ticker": tickers,
+        "quantity": quantity,
+        "total_cost": quantity * rng.uniform(5, 2000, n_positions),
+        "name": tickers,
+        "sector": pd.Categorical(rng.choice(SECTORS, n_positions)),
+        "industry": pd.Categorical(rng.choice(SECTORS, n_positions)),
+        "currency": pd.Categorical(rng.choice(CURRENCIES, n_positions))
+    }).set_index("ticker")
+
+    market_data = {ticker: {"current_price": price} for ticker, price in zip(tickers, rng.uniform(5, 2000, n_positions))}
+    return df, market_data
+
+
+def perform_analysis_rowwise(df: pd.DataFrame, market_data: dict, base_currency: str) -> pd.DataFrame:
+    """The valuation as it was done before: one pd.Series and two scalar conversions per row."""
+    c = fx.get_converter()
+    df['current_price'] = df.index.map(lambda x: market_data.get(x, {}).get('current_price'))
+    df.dropna(subset=['current_price'], inplace=True)
+
+    def convert_to_base(row):
+        local_market_value = row['current_price'] * row['quantity']
+        cost_base = c.convert(row['total_cost'], row['currency'], base_currency)
+        market_value_base = c.convert(local_market_value, row['currency'], base_currency)
+        return pd.Series([cost_base, market_value_base])
+
+    df[['total_cost_base', 'market_value_base']] = df.apply(convert_to_base, axis=1)
+    df['gain_loss_base'] = df['market_value_base'] - df['total_cost_base']
+    df['gain_loss_pct'] = (df['gain_loss_base'] / df['total_cost_base']).replace([np.inf, -np.inf], 0) * 100
+    total_market_value = df['market_value_base'].sum()
+    df['pct_of_portfolio'] = (df['market_value_base'] / total_market_value) * 100 if total_market_value else 0
+    return df
+
+
+def best_of(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(n_positions: int=10_000, repeats: int=3):
+    df, market_data = make_portfolio(n_positions)
+    base_currency = "INR"
+
+    # Load the ECB table up front so neither side pays for it.
+    fx.get_converter()
+
+    rowwise = perform_analysis_rowwise(df.copy(), market_data, base_currency)
+    columnar, _ = perform_analysis(df.copy(), market_data, base_currency)
+    columnar = columnar.reindex(rowwise.index)
+
+    for column in ["total_cost_base", "market_value_base", "gain_loss_pct", "pct_of_portfolio"]:
+        if not np.allclose(rowwise[column], columnar[column], rtol=1e-9, equal_nan=True):
+            raise AssertionError(f"{column} differs between the row-wise and columnar valuation")
+
+    rowwise_time = best_of(lambda: perform_analysis_rowwise(df.copy(), market_data, base_currency), repeats)
+    columnar_time = best_of(lambda: perform_analysis(df.copy(), market_data, base_currency), repeats)
+
+    print(f"positions:  {n_positions:,}")
+    print(f"row-wise:   {rowwise_time * 1000:10.1f} ms")
+    print(f"columnar:   {columnar_time * 1000:10.1f} ms")
+    print(f"speedup:    {rowwise_time / columnar_time:10.1f}x")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,274 @@
+"""
+Record/replay of every network call the agent makes: yahooquery Ticker data, yq.search,
+yahooquery Screener, yf.screen, yf.Industry and ChatGoogleGenerativeAI.invoke.
+
+Run once with CASSETTE_MODE=record to capture the calls of a session into
+CASSETTE_PATH (an lzma compressed pickle). With CASSETTE_MODE=replay the same calls are
+answered from that file without touching the network, after sleeping for the recorded
+duration of each call (CASSETTE_LATENCY=recorded, the default) or for a fixed number of
+seconds (e.g. CASSETTE_LATENCY=0.05, or 0 for no latency).
+
+A replayed call is matched on its target and arguments; a call whose arguments differ
+from the recording (e.g. a prompt containing today's date) gets the next unused
+recording of the same target, so a pipeline that makes its calls in the same order
+replays deterministically. Fixtures are pickles: only replay files you recorded.
+"""
+import atexit
+import hashlib
+import json
+import lzma
+import os
+import pickle
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+DEFAULT_CASSETTE_PATH = os.path.join("benchmarks", "fixtures", "session.cassette.xz")
+
+TICKER_METHODS = ["get_modules", "history", "income_statement", "cash_flow", "balance_sheet"]
+TICKER_PROPERTIES = [
+    "price", "quote_type", "summary_detail", "summary_profile", "financial_data", "valuation_measures",
+    "fund_performance", "fund_sector_weightings", "fund_equity_holdings"
+]
+INDUSTRY_PROPERTIES = ["top_companies", "top_performing_companies", "top_growth_companies"]
+
+
+_INHERITED = object()
+
+
+class CassetteMiss(KeyError):
+    """A replayed call has no recording left for its target."""
+
+
+def _canonical(value):
+    # Chat messages compare by role and text; everything else by its JSON (or repr) form.
+    if hasattr(value, "type") and hasattr(value, "content"):
+        return {"type": value.type, "content": value.content}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    return value
+
+
+def _fingerprint(*parts) -> str:
+    text = json.dumps(_canonical(list(parts)), sort_keys=True, default=repr)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    Recordings of network calls, as {target: [(fingerprint, outcome, duration), ...]} in
+    call order; outcome is ("return", value) or ("raise", exception).
+    """
+
+    def __init__(self, path: str=DEFAULT_CASSETTE_PATH, mode: str="replay", latency="recorded"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported cassette mode '{mode}'. Use 'record' or 'replay'.")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._recordings = defaultdict(list)
+        self._used = defaultdict(set)
+        self._patches = []
+
+        if mode == "replay":
+            with lzma.open(path, "rb") as f:
+                self._recordings.update(pickle.load(f))
+
+
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            recordings = dict(self._recordings)
+        with lzma.open(self.path, "wb") as f:
+            pickle.dump(recordings, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+
+    def call(self, target: str, fingerprint: str, fetch):
+        """Runs fetch() and records it, or replays the recording of the same call."""
+        if self.mode == "record":
+            start = time.perf_counter()
+            try:
+                outcome = ("return", fetch())
+            except Exception as e:
+                outcome = ("raise", e)
+            with self._lock:
+                self._recordings[target].append((fingerprint, outcome, time.perf_counter() - start))
+        else:
+            outcome, duration = self._replay(target, fingerprint)
+            time.sleep(duration if self.latency == "recorded" else float(self.latency))
+
+        kind, value = outcome
+        if kind == "raise":
+            raise value
+        return value
+
+
+
+    def _replay(self, target: str, fingerprint: str):
+        with self._lock:
+            recordings = self._recordings.get(target, [])
+            used = self._used[target]
+
+            unused = [i for i in range(len(recordings)) if i not in used]
+            matching = [i for i in unused if recordings[i][0] == fingerprint]
+            if not unused:
+                # Every recording has been replayed; calls repeat their last exact match.
+                matching = [i for i in range(len(recordings)) if recordings[i][0] == fingerprint][-1:]
+                if not matching:
+                    raise CassetteMiss(f"No recording left for {target} in {self.path}")
+                position = matching[0]
+            else:
+                position = (matching or unused)[0]
+
+            used.add(position)
+            _, outcome, duration = recordings[position]
+            return outcome, duration
+
+
+
+    def _patch(self, owner, name, replacement):
+        # Class attributes are restored from the class's own __dict__, so an inherited
+        # attribute (_INHERITED) is removed again instead of being copied onto the class.
+        original = vars(owner).get(name, _INHERITED)
+        self._patches.append((owner, name, original))
+        setattr(owner, name, replacement)
+
+
+
+    def install(self):
+        """Routes the supported libraries' network calls through this cassette."""
+        self._patch_yahooquery()
+        self._patch_yfinance()
+        self._patch_gemini()
+        if self.mode == "record":
+            atexit.register(self.save)
+        return self
+
+
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._patches):
+            if original is _INHERITED:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._patches.clear()
+
+
+
+    def __enter__(self):
+        return self.install()
+
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.uninstall()
+        if self.mode == "record":
+            atexit.unregister(self.save)
+            self.save()
+
+
+
+    def _patch_instance_init(self, cls, target: str):
+        """Remembers each instance's constructor arguments; replayed instances never connect."""
+        original_init = cls.__init__
+        cassette = self
+
+        def __init__(instance, *args, **kwargs):
+            instance._cassette_key = (target, args, kwargs)
+            if cassette.mode == "record":
+                original_init(instance, *args, **kwargs)
+
+        self._patch(cls, "__init__", __init__)
+
+
+
+    def _method(self, target: str, original):
+        cassette = self
+
+        def method(instance, *args, **kwargs):
+            return cassette.call(target, _fingerprint(instance._cassette_key, args, kwargs), lambda: original(instance, *args, **kwargs))
+        return method
+
+
+
+    def _property(self, target: str, original: property):
+        cassette = self
+        return property(lambda instance: cassette.call(target, _fingerprint(instance._cassette_key), lambda: original.fget(instance)))
+
+
+
+    def _function(self, target: str, original):
+        cassette = self
+
+        def function(*args, **kwargs):
+            return cassette.call(target, _fingerprint(args, kwargs), lambda: original(*args, **kwargs))
+        return function
+
+
+
+    def _patch_yahooquery(self):
+        import yahooquery
+
+        self._patch_instance_init(yahooquery.Ticker, "Ticker")
+        for name in TICKER_METHODS:
+            self._patch(yahooquery.Ticker, name, self._method(f"Ticker.{name}", getattr(yahooquery.Ticker, name)))
+        for name in TICKER_PROPERTIES:
+            self._patch(yahooquery.Ticker, name, self._property(f"Ticker.{name}", getattr(yahooquery.Ticker, name)))
+
+        self._patch(yahooquery, "search", self._function("search", yahooquery.search))
+
+        self._patch_instance_init(yahooquery.Screener, "Screener")
+        self._patch(yahooquery.Screener, "get_screeners", self._method("Screener.get_screeners", yahooquery.Screener.get_screeners))
+
+
+
+    def _patch_yfinance(self):
+        import yfinance
+
+        self._patch(yfinance, "screen", self._function("yf.screen", yfinance.screen))
+
+        self._patch_instance_init(yfinance.Industry, "Industry")
+        for name in INDUSTRY_PROPERTIES:
+            self._patch(yfinance.Industry, name, self._property(f"Industry.{name}", getattr(yfinance.Industry, name)))
+
+
+
+    def _patch_gemini(self):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        original = ChatGoogleGenerativeAI.invoke
+        cassette = self
+
+        def invoke(llm, input, config=None, **kwargs):
+            settings = {
+                "model": llm.model,
+                "temperature": llm.temperature,
+                "response_schema": getattr(llm, "response_schema", None)
+            }
+            return cassette.call("ChatGoogleGenerativeAI.invoke", _fingerprint(settings, input, kwargs), lambda: original(llm, input, config, **kwargs))
+
+        self._patch(ChatGoogleGenerativeAI, "invoke", invoke)
+
+
+def install_from_env() -> Optional[Cassette]:
+    """Installs a cassette when CASSETTE_MODE is set (see the module docstring)."""
+    mode = os.getenv("CASSETTE_MODE")
+    if not mode:
+        return None
+
+    return Cassette(
+        os.getenv("CASSETTE_PATH", DEFAULT_CASSETTE_PATH),
+        mode.lower(),
+        os.getenv("CASSETTE_LATENCY", "recorded")
+    ).install()
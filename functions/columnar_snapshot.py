@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+
+POSITIONS_SCHEMA = pa.schema([
+    pa.field("ticker", pa.string()),
+    pa.field("quantity", pa.float64()),
+    pa.field("total_cost", pa.float64()),
+    pa.field("weighted_avg_cost", pa.float64()),
+    pa.field("name", pa.string()),
+    pa.field("sector", pa.dictionary(pa.int32(), pa.string())),
+    pa.field("industry", pa.dictionary(pa.int32(), pa.string())),
+    pa.field("currency", pa.dictionary(pa.int32(), pa.string()))
+])
+
+SIGNATURE_KEY = b"source_signature"
+
+
+def snapshot_path(manager) -> str:
+    return manager.filepath + ".positions.arrow"
+
+
+def _encode_signature(signature: tuple) -> bytes:
+    return json.dumps(signature).encode("utf-8")
+
+
+def write_positions_snapshot(positions: list, path: str, signature: tuple) -> pa.Table:
+    """
+    Writes positions as an uncompressed Arrow IPC file, so it can be memory-mapped
+    back without a copy. signature identifies the holdings it was built from.
+    """
+    columns = {field.name: [p.get(field.name) for p in positions] for field in POSITIONS_SCHEMA}
+    table = pa.table(
+        {name: pa.array(values, type=POSITIONS_SCHEMA.field(name).type) for name, values in columns.items()},
+        schema=POSITIONS_SCHEMA.with_metadata({SIGNATURE_KEY: _encode_signature(signature)})
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    os.close(fd)
+    try:
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        try:
+            os.replace(tmp_path, path)
+        except PermissionError:
+            # Windows refuses to replace a file another reader still has mapped;
+            # serve this table from memory and let a later call persist it.
+            os.remove(tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return table
+
+
+def _read_snapshot(path: str, signature: tuple):
+    """Memory-maps the snapshot; returns None if it is missing, unreadable or was built from other holdings."""
+    if not os.path.exists(path):
+        return None
+
+    try:
+        source = pa.memory_map(path, "r")
+        reader = pa.ipc.open_file(source)
+        metadata = reader.schema.metadata or {}
+        if metadata.get(SIGNATURE_KEY) != _encode_signature(signature):
+            return None
+        return reader.read_all()
+    except (OSError, pa.ArrowInvalid):
+        # A truncated or damaged snapshot is just a stale one; it is rebuilt from the holdings.
+        return None
+
+
+def load_positions_frame(manager) -> pd.DataFrame:
+    """
+    Returns the manager's positions as a DataFrame indexed by ticker, loaded from the
+    memory-mapped Arrow snapshot. The snapshot is rewritten on demand whenever the
+    holdings changed since it was built. sector, industry and currency come back as
+    pandas categoricals.
+    """
+    path = snapshot_path(manager)
+    signature = manager._signature()
+
+    table = _read_snapshot(path, signature)
+    if table is None:
+        table = write_positions_snapshot(manager.list_positions(), path, signature)
+
+    return table.to_pandas().set_index("ticker")
@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """
+    Advisory lock on "<path>.lock", shared by threads in this process and by other
+    processes (e.g. the Streamlit app and the CLI agent working on the same file).
+
+    The lock is re-entrant per thread, so a locked method can call another locked method.
+    """
+
+    _registry_lock = threading.Lock()
+    _thread_locks: Dict[str, threading.RLock] = {}
+    _depth: Dict[str, int] = {}
+    _handles: Dict[str, object] = {}
+
+    def __init__(self, path: str, timeout: float=30.0, poll_interval: float=0.05):
+        self.lock_path = path + ".lock"
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+        with FileLock._registry_lock:
+            self._thread_lock = FileLock._thread_locks.setdefault(self.lock_path, threading.RLock())
+
+
+
+    def acquire(self):
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Timed out waiting for lock on {self.lock_path}")
+
+        try:
+            if FileLock._depth.get(self.lock_path, 0) == 0:
+                FileLock._handles[self.lock_path] = self._acquire_os_lock()
+            FileLock._depth[self.lock_path] = FileLock._depth.get(self.lock_path, 0) + 1
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+
+
+    def release(self):
+        FileLock._depth[self.lock_path] -= 1
+        if FileLock._depth[self.lock_path] == 0:
+            self._release_os_lock(FileLock._handles.pop(self.lock_path))
+        self._thread_lock.release()
+
+
+
+    def _acquire_os_lock(self):
+        handle = open(self.lock_path, "a+")
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                if os.name == "nt":
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return handle
+            except OSError:
+                if time.monotonic() >= deadline:
+                    handle.close()
+                    raise TimeoutError(f"Timed out waiting for lock on {self.lock_path}")
+                time.sleep(self.poll_interval)
+
+
+
+    def _release_os_lock(self, handle):
+        try:
+            if os.name == "nt":
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            handle.close()
+
+
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+
+def atomic_write_json(path: str, data, indent: int=4):
+    """
+    Writes JSON to a temporary file in the same directory and swaps it in with
+    os.replace, so readers only ever see the old or the new file, never a partial one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # On Windows the target can be briefly held open by a reader.
+        for attempt in range(10):
+            try:
+                os.replace(tmp_path, path)
+                break
+            except PermissionError:
+                if attempt == 9:
+                    raise
+                time.sleep(0.05)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,81 @@
+import os
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+import pandas as pd
+
+from functions.history_store import read_parquet, write_parquet
+from functions.portfolios import DATABASE_DIR
+
+FUNDAMENTALS_DIR = os.path.join(DATABASE_DIR, "fundamentals")
+
+# Length of a reporting period, and how long after a period ends its figures usually
+# show up on Yahoo (10-Q filings are due within ~40-45 days, 10-Ks within ~60-90).
+REPORTING_CADENCE = {
+    "q": (timedelta(days=92), timedelta(days=45)),
+    "a": (timedelta(days=366), timedelta(days=90))
+}
+
+# Once a new period is overdue, how often to look for it.
+RECHECK_AFTER = timedelta(days=1)
+
+
+class FundamentalsStore:
+    """
+    On-disk financial statements, one zstd compressed Parquet file per (symbol, statement,
+    frequency) under Database/fundamentals/<statement>/<frequency>/.
+
+    A stored statement stays valid until its next period is expected to have been filed:
+    the latest asOfDate plus the reporting cadence plus the usual filing lag. After that
+    it is re-fetched at most once every RECHECK_AFTER until the new period appears.
+    """
+
+    def __init__(self, directory: str=FUNDAMENTALS_DIR):
+        self.directory = directory
+
+
+
+    def _path(self, symbol: str, statement: str, frequency: str) -> str:
+        directory = os.path.join(self.directory, statement, frequency)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, symbol.replace("/", "_").replace("\\", "_") + ".parquet")
+
+
+
+    @staticmethod
+    def _is_fresh(metadata: dict, frequency: str, now: datetime) -> bool:
+        cadence, filing_lag = REPORTING_CADENCE.get(frequency[0], REPORTING_CADENCE["q"])
+        fetched_at = datetime.fromisoformat(metadata["fetched_at"])
+
+        latest_as_of = metadata.get("latest_as_of")
+        if latest_as_of is None:
+            return now - fetched_at < RECHECK_AFTER
+
+        next_filing = datetime.fromisoformat(latest_as_of) + cadence + filing_lag
+        return now < next_filing or now - fetched_at < RECHECK_AFTER
+
+
+
+    def get(self, symbol: str, statement: str, frequency: str, fetch: Callable[[], object]) -> Optional[pd.DataFrame]:
+        """
+        The stored statement, or the result of fetch() when there is none or it is stale.
+        Returns None if fetch does not return a DataFrame (yahooquery returns an error
+        string for symbols it has no statements for).
+        """
+        path = self._path(symbol, statement, frequency)
+        now = datetime.now()
+
+        df, metadata = read_parquet(path)
+        if df is not None and metadata.get("fetched_at") and self._is_fresh(metadata, frequency, now):
+            return df.set_index("symbol") if "symbol" in df.columns else df
+
+        fetched = fetch()
+        if not isinstance(fetched, pd.DataFrame):
+            return None
+
+        latest_as_of = None
+        if "asOfDate" in fetched.columns and fetched["asOfDate"].notna().any():
+            latest_as_of = pd.Timestamp(fetched["asOfDate"].max()).isoformat()
+
+        write_parquet(fetched, path, {"fetched_at": now.isoformat(), "latest_as_of": latest_as_of})
+        return fetched
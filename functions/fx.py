@@ -0,0 +1,53 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from currency_converter import CurrencyConverter
+
+_converter: Optional[CurrencyConverter] = None
+_converter_lock = threading.Lock()
+
+# Latest rate per (from, to) pair, looked up once per process.
+_rates: Dict[Tuple[str, str], float] = {}
+
+
+def get_converter() -> CurrencyConverter:
+    """The process-wide CurrencyConverter; the bundled ECB rate history is parsed on first use."""
+    global _converter
+    if _converter is None:
+        with _converter_lock:
+            if _converter is None:
+                _converter = CurrencyConverter()
+    return _converter
+
+
+def rate(from_currency: str, to_currency: str) -> float:
+    """Latest rate from from_currency to to_currency. Raises ValueError for unsupported currencies."""
+    key = (from_currency, to_currency)
+    if key not in _rates:
+        _rates[key] = 1.0 if from_currency == to_currency else get_converter().convert(1.0, from_currency, to_currency)
+    return _rates[key]
+
+
+def convert_value(amount: float, from_currency: str, to_currency: str) -> float:
+    return amount * rate(from_currency, to_currency)
+
+
+def convert(amounts, from_currencies, to_currency: str) -> np.ndarray:
+    """
+    Converts a whole column of amounts into to_currency, with one rate lookup per
+    distinct source currency. from_currencies is a single code or an array/Series of
+    codes aligned with amounts; a missing (NaN) code gives NaN. Returns a float array
+    aligned with amounts.
+    """
+    amounts = np.asarray(amounts, dtype=float)
+
+    if isinstance(from_currencies, str):
+        return amounts * rate(from_currencies, to_currency)
+
+    codes, currencies = pd.factorize(np.asarray(from_currencies, dtype=object))
+    # The extra trailing NaN is picked up by code -1, i.e. missing currencies.
+    rates = np.array([rate(currency, to_currency) for currency in currencies] + [np.nan])
+
+    return amounts * rates[codes]
@@ -0,0 +1,251 @@
+import json
+import os
+import re
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from yahooquery import Ticker
+
+from functions.portfolios import DATABASE_DIR
+from functions.request_governor import is_throttled, yahoo_batch_request
+
+HISTORY_DIR = os.path.join(DATABASE_DIR, "history")
+
+# Intraday bars go stale within minutes and Yahoo only keeps a short window of them,
+# so only these intervals are stored; everything else is passed through to Yahoo.
+CACHED_INTERVALS = {"1d"}
+
+METADATA_KEY = b"history_store"
+
+HISTORY_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+
+def period_start(period: str, today: Optional[pd.Timestamp]=None) -> Optional[pd.Timestamp]:
+    """
+    First date covered by a Yahoo style period ("60d", "1mo", "3mo", "1y", "ytd", ...),
+    counted back from today. Returns None for "max".
+    """
+    today = (today or pd.Timestamp.now()).normalize()
+
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=today.year, month=1, day=1)
+
+    match = _PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period '{period}'")
+
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return today - pd.DateOffset(days=count)
+    if unit == "wk":
+        return today - pd.DateOffset(weeks=count)
+    if unit == "mo":
+        return today - pd.DateOffset(months=count)
+    return today - pd.DateOffset(years=count)
+
+
+def _normalize_dates(values) -> pd.DatetimeIndex:
+    # Daily history comes back as dates, except today's live bar which is a tz-aware
+    # timestamp in exchange time; keep the local calendar date of every bar.
+    dates = []
+    for value in values:
+        value = pd.Timestamp(value)
+        if value.tzinfo is not None:
+            value = value.tz_localize(None)
+        dates.append(value)
+    return pd.DatetimeIndex(dates).normalize()
+
+
+def _history_by_symbol(history):
+    """
+    yahooquery history as {symbol: frame or error message}. yahooquery answers with one
+    (symbol, date) indexed frame when every symbol was fetched, and with a dict of date
+    indexed frames and error messages when any symbol failed.
+    """
+    if isinstance(history, pd.DataFrame):
+        return {symbol: df.droplevel("symbol") for symbol, df in history.groupby(level="symbol")}
+    return history
+
+
+def _split_history(history) -> Dict[str, pd.DataFrame]:
+    """Normalizes the frames of _history_by_symbol to one date indexed frame per symbol, dropping error messages."""
+    if not isinstance(history, dict):
+        return {}
+
+    frames = {}
+    for symbol, df in history.items():
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            continue
+        df = df.copy()
+        df.index = _normalize_dates(df.index)
+        df.index.name = "date"
+        frames[symbol] = df[~df.index.duplicated(keep="last")].sort_index()
+    return frames
+
+
+def write_parquet(df: pd.DataFrame, path: str, metadata: dict):
+    """Atomically writes df (index included as columns) as zstd Parquet, with metadata stored under METADATA_KEY."""
+    table = pa.Table.from_pandas(df.reset_index(), preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), METADATA_KEY: json.dumps(metadata).encode("utf-8")})
+
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(path) or ".")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_parquet(path: str) -> Tuple[Optional[pd.DataFrame], dict]:
+    """The frame and metadata written by write_parquet, or (None, {}) if the file is missing or unreadable."""
+    if not os.path.exists(path):
+        return None, {}
+
+    try:
+        table = pq.read_table(path)
+    except (OSError, pa.ArrowInvalid):
+        # A damaged file is just a cache miss; it is rewritten on the next write.
+        return None, {}
+
+    metadata = json.loads((table.schema.metadata or {}).get(METADATA_KEY, b"{}"))
+    return table.to_pandas(), metadata
+
+
+class HistoryStore:
+    """
+    On-disk OHLCV history, one zstd compressed Parquet file per (symbol, interval)
+    under Database/history/<interval>/.
+
+    Each file remembers how far back it reaches (coverage_start) and when it was last
+    topped up from Yahoo (fetched_at). A request for any period is sliced out of the
+    stored bars; Yahoo is only asked for symbols that do not reach back far enough yet,
+    and for the bars since the last stored one once refresh_after has passed.
+    """
+
+    def __init__(self, interval: str="1d", directory: str=HISTORY_DIR, refresh_after: timedelta=timedelta(hours=1)):
+        self.interval = interval
+        self.directory = os.path.join(directory, interval)
+        self.refresh_after = refresh_after
+        os.makedirs(self.directory, exist_ok=True)
+
+
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.directory, symbol.replace("/", "_").replace("\\", "_") + ".parquet")
+
+
+
+    def _read(self, symbol: str) -> Tuple[Optional[pd.DataFrame], dict]:
+        df, metadata = read_parquet(self._path(symbol))
+        if df is None:
+            return None, {}
+        return df.set_index("date"), metadata
+
+
+
+    def _write(self, symbol: str, df: pd.DataFrame, metadata: dict):
+        write_parquet(df, self._path(symbol), metadata)
+
+
+
+    def _fetch(self, symbols: List[str], start: Optional[pd.Timestamp]) -> Dict[str, pd.DataFrame]:
+        """
+        One multi-symbol request for the bars of symbols since start (everything when
+        start is None). A symbol Yahoo answered without any bars gets an empty frame;
+        one that is still throttled is left out.
+        """
+        if start is None:
+            range_kwargs = {"period": "max"}
+        else:
+            range_kwargs = {"start": start.strftime("%Y-%m-%d")}
+
+        history = yahoo_batch_request(
+            "history", symbols,
+            lambda batch: _history_by_symbol(Ticker(batch, asynchronous=True).history(interval=self.interval, **range_kwargs))
+        )
+        frames = _split_history(history)
+
+        if isinstance(history, dict):
+            for symbol in symbols:
+                if symbol not in frames and not is_throttled(history.get(symbol)):
+                    frames[symbol] = pd.DataFrame(columns=HISTORY_COLUMNS, index=pd.DatetimeIndex([], name="date"))
+        return frames
+
+
+
+    @staticmethod
+    def _covers(metadata: dict, start: Optional[pd.Timestamp]) -> bool:
+        coverage_start = metadata.get("coverage_start")
+        if coverage_start is None:
+            return False
+        if coverage_start == "max":
+            return True
+        return start is not None and pd.Timestamp(coverage_start) <= start
+
+
+
+    def get(self, symbols: List[str], period: str) -> pd.DataFrame:
+        """
+        Bars of every symbol for period, in the (symbol, date) indexed layout of
+        yahooquery's Ticker.history. Symbols Yahoo has no data for are left out; they
+        are stored empty, so they are only asked for again after refresh_after.
+        """
+        start = period_start(period)
+        now = datetime.now()
+
+        frames = {}
+        metadata_by_symbol = {}
+        stale = []
+        missing = []
+
+        for symbol in dict.fromkeys(symbols):
+            df, metadata = self._read(symbol)
+            expired = df is not None and now - datetime.fromisoformat(metadata["fetched_at"]) > self.refresh_after
+            # A symbol stored without bars has nothing to top up; once expired it is fetched again in full.
+            if df is None or not self._covers(metadata, start) or (df.empty and expired):
+                missing.append(symbol)
+                continue
+
+            frames[symbol] = df
+            metadata_by_symbol[symbol] = metadata
+            if expired:
+                stale.append(symbol)
+
+        if missing:
+            fetched = self._fetch(missing, start)
+            for symbol, df in fetched.items():
+                self._write(symbol, df, {"coverage_start": "max" if start is None else start.strftime("%Y-%m-%d"), "fetched_at": now.isoformat()})
+                frames[symbol] = df
+
+        if stale:
+            # Re-fetch from the last stored bar, so a bar that was still live when stored gets its final values.
+            tail_start = min(frames[symbol].index.max() for symbol in stale)
+            fetched = self._fetch(stale, tail_start)
+            for symbol in stale:
+                df = frames[symbol]
+                if symbol in fetched and not fetched[symbol].empty:
+                    df = pd.concat([df, fetched[symbol]])
+                    df = df[~df.index.duplicated(keep="last")].sort_index()
+
+                self._write(symbol, df, {**metadata_by_symbol[symbol], "fetched_at": now.isoformat()})
+                frames[symbol] = df
+
+        sliced = {symbol: df if start is None else df[df.index >= start] for symbol, df in frames.items() if not df.empty}
+        if not sliced:
+            return pd.DataFrame(
+                columns=HISTORY_COLUMNS,
+                index=pd.MultiIndex.from_arrays([[], []], names=["symbol", "date"])
+            )
+
+        return pd.concat(sliced, names=["symbol", "date"])
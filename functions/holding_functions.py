@@ -1,10 +1,42 @@
 import json
 import os
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Tuple
+
+from functions.file_lock import FileLock, atomic_write_json
+from functions.position_index import PositionIndex
+
+DEFAULT_HOLDINGS_PATH = r"C:\\Users\\yuvra\\OneDrive\\Desktop\\Portfolio Manager Agent\\Database\\holdings.json"
+
+# Parsed holdings shared by every HoldingsManager in the process, keyed on file path.
+# Each entry is (signature, holdings, positions); the signature is the (inode, mtime, size)
+# of the backing files, so edits made by other processes invalidate the entry. positions
+# is the PositionIndex for those holdings, or None until someone asks for it.
+_holdings_cache: Dict[str, Tuple[tuple, List[Dict], Optional[PositionIndex]]] = {}
+_holdings_cache_lock = threading.Lock()
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _update_fields(update: dict) -> dict:
+    """Fields changed by an update of the form {"transaction_id", "updated_quantity", "updated_price"}; -1 means unchanged."""
+    fields = {}
+    if(update.get("updated_quantity", -1) != -1):
+        fields["quantity"] = update["updated_quantity"]
+    if(update.get("updated_price", -1) != -1):
+        fields["price"] = update["updated_price"]
+    return fields
+
 
 class HoldingsManager:
     
-    def __init__(self, filepath: str=r"C:\\Users\\yuvra\\OneDrive\\Desktop\\Portfolio Manager Agent\\Database\\holdings.json"):
+    def __init__(self, filepath: str=DEFAULT_HOLDINGS_PATH):
         self.filepath = filepath
         self._ensure_file_exists()
 
@@ -12,41 +44,141 @@ class HoldingsManager:
 
     def _ensure_file_exists(self):
         if not os.path.exists(self.filepath):
-            with open(self.filepath, "w") as f:
-                json.dump([], f)
+            with self._lock():
+                if not os.path.exists(self.filepath):
+                    atomic_write_json(self.filepath, [])
 
 
 
-    def _load(self) -> List[Dict]:
+    def _lock(self) -> FileLock:
+        """Lock held around every read-modify-write cycle on the holdings file."""
+        return FileLock(self.filepath)
+
+
+
+    def _signature(self) -> tuple:
+        return (_file_signature(self.filepath),)
+
+
+
+    def _read(self) -> List[Dict]:
         with open(self.filepath, "r") as f:
             return json.load(f)
+
+
+
+    def _cached(self, signature: tuple) -> Optional[List[Dict]]:
+        with _holdings_cache_lock:
+            entry = _holdings_cache.get(self.filepath)
+        if entry and entry[0] == signature:
+            return entry[1]
+        return None
+
+
+
+    def _cached_positions(self, signature: tuple) -> Optional[PositionIndex]:
+        with _holdings_cache_lock:
+            entry = _holdings_cache.get(self.filepath)
+        if entry and entry[0] == signature:
+            return entry[2]
+        return None
+
+
+
+    def _remember(self, signature: tuple, holdings: List[Dict], positions: Optional[PositionIndex]=None):
+        with _holdings_cache_lock:
+            _holdings_cache[self.filepath] = (signature, holdings, positions)
+
+
+
+    def _rolled_positions(self, removed: List[dict], added: List[dict]) -> Optional[PositionIndex]:
+        """
+        Applies a write's removed/added lots to the cached position index. Returns None
+        when there is no index for the current file contents; it is then rebuilt lazily.
+        """
+        positions = self._cached_positions(self._signature())
+        if positions is None:
+            return None
+
+        positions = positions.copy()
+        for holding in removed:
+            positions.remove(holding)
+        for holding in added:
+            positions.add(holding)
+        return positions
+
+
+
+    def _load(self) -> List[Dict]:
+        signature = self._signature()
+        holdings = self._cached(signature)
+
+        if holdings is None:
+            holdings = self._read()
+            self._remember(signature, holdings)
+
+        # Callers are free to mutate what they get back, so hand out row copies.
+        return [dict(h) for h in holdings]
         
 
         
-    def _save(self, holding: List[dict]):
-        with open(self.filepath, "w") as f:
-            json.dump(holding, f, indent=4)
+    def _save(self, holding: List[dict], removed: List[dict]=(), added: List[dict]=()):
+        positions = self._rolled_positions(removed, added)
+
+        atomic_write_json(self.filepath, holding)
+
+        self._remember(self._signature(), [dict(h) for h in holding], positions)
 
 
 
     def add_holding(self, holding: dict) -> str:
-        holdings = self._load()
-        holdings.append(holding)
-        self._save(holdings)
+        with self._lock():
+            holdings = self._load()
+            holdings.append(holding)
+            self._save(holdings, added=[holding])
 
-        return "Holdings have been added successfully to demat account"
+            return "Holdings have been added successfully to demat account"
+
+
+
+    def add_holdings(self, new_holdings: List[dict]) -> str:
+        with self._lock():
+            holdings = self._load()
+            holdings.extend(new_holdings)
+            self._save(holdings, added=new_holdings)
+
+            return f"{len(new_holdings)} holdings have been added successfully to demat account"
 
 
 
     def list_holdings(self) -> List[dict]:
         return self._load()
+
+
+
+    def list_positions(self) -> List[dict]:
+        """Aggregated position per ticker (quantity, total cost, weighted average cost, ...)."""
+        signature = self._signature()
+        positions = self._cached_positions(signature)
+
+        if positions is None:
+            holdings = self._load()
+            positions = PositionIndex.from_holdings(holdings)
+            with _holdings_cache_lock:
+                entry = _holdings_cache.get(self.filepath)
+                if entry and entry[0] == signature:
+                    _holdings_cache[self.filepath] = (signature, entry[1], positions)
+
+        return positions.rows()
     
 
     
     def clear_all_holdings(self):
-        self._save([])
+        with self._lock():
+            # Every lot goes, so the position index has to drop them all too.
+            self._save([], removed=self._load())
 
-        return "All holdings have been cleared successfully from demat account"
+            return "All holdings have been cleared successfully from demat account"
 
 
 
@@ -66,46 +198,130 @@ class HoldingsManager:
 
     
     def delete_holding_by_transaction_id(self, transaction_id: str) -> str:
-        holdings = self._load()
-        new_holdings = []
+        return self.delete_holdings_by_transaction_ids([transaction_id])[0]
+
 
-        for h in holdings:
-            if(h["transaction_id"] != transaction_id):
-                new_holdings.append(h)
 
-        self._save(new_holdings)
+    def delete_holdings_by_transaction_ids(self, transaction_ids: List[str]) -> List[str]:
+        """Deletes many holdings with a single write. Returns one message per transaction ID."""
+        with self._lock():
+            holdings = self._load()
+            wanted = set(transaction_ids)
+            new_holdings = []
+            removed = []
 
-        return f"holding with Transaction ID {transaction_id} deleted successfully"
+            for h in holdings:
+                if(h["transaction_id"] not in wanted):
+                    new_holdings.append(h)
+                else:
+                    removed.append(h)
+
+            if removed:
+                self._save(new_holdings, removed=removed)
+
+            deleted = {h["transaction_id"] for h in removed}
+            return [
+                f"holding with Transaction ID {transaction_id} deleted successfully" if transaction_id in deleted
+                else f"holding with Transaction ID {transaction_id} not found!"
+                for transaction_id in transaction_ids
+            ]
 
 
 
     def delete_holding_by_ticker(self, ticker: str) -> str:
-        holdings = self._load()
-        is_deleted = False
-        new_holdings = []
+        return self.delete_holdings_by_tickers([ticker])[0]
 
-        for h in holdings:
-            if(h["ticker"] != ticker):
-                new_holdings.append(h)
-            else:
-                is_deleted = True
-        self._save(new_holdings)
-
-        if(is_deleted == False):
-            return f"holding with ticker '{ticker}' not found!"
-        
-        return f"Holdings with ticker '{ticker}' deleted successfully"
+
+
+    def delete_holdings_by_tickers(self, tickers: List[str]) -> List[str]:
+        """Deletes every lot of many tickers with a single write. Returns one message per ticker."""
+        with self._lock():
+            holdings = self._load()
+            wanted = set(tickers)
+            new_holdings = []
+            removed = []
+
+            for h in holdings:
+                if(h["ticker"] not in wanted):
+                    new_holdings.append(h)
+                else:
+                    removed.append(h)
+
+            if removed:
+                self._save(new_holdings, removed=removed)
+
+            deleted = {h["ticker"] for h in removed}
+            return [
+                f"Holdings with ticker '{ticker}' deleted successfully" if ticker in deleted
+                else f"holding with ticker '{ticker}' not found!"
+                for ticker in tickers
+            ]
 
 
 
     def update_holding(self, transaction_id: str, updated_quantity: int, updated_price: int) -> str:
-        holdings = self._load()
-        for h in holdings:
-            if h["transaction_id"] == transaction_id:
-                if(updated_quantity != -1):
-                    h["quantity"] = updated_quantity
-                if(updated_price != -1):
-                    h["price"] = updated_price
-                self._save(holdings)
-                return f"Holding with Transaction ID {transaction_id} updated successfully"  
-        return f"Holding with Transaction ID {transaction_id} could not be updated"
+        return self.update_holdings([{
+            "transaction_id": transaction_id,
+            "updated_quantity": updated_quantity,
+            "updated_price": updated_price
+        }])[0]
+
+
+
+    def update_holdings(self, updates: List[dict]) -> List[str]:
+        """
+        Applies many updates with a single write. Each update is a dict with transaction_id
+        and optional updated_quantity / updated_price (-1 or missing means unchanged).
+        Returns one message per update.
+        """
+        with self._lock():
+            holdings = self._load()
+            by_id = {h["transaction_id"]: h for h in holdings}
+            previous = {}
+            messages = []
+
+            for update in updates:
+                transaction_id = update["transaction_id"]
+                h = by_id.get(transaction_id)
+                if h is None:
+                    messages.append(f"Holding with Transaction ID {transaction_id} could not be updated")
+                    continue
+
+                previous.setdefault(transaction_id, dict(h))
+                h.update(_update_fields(update))
+                messages.append(f"Holding with Transaction ID {transaction_id} updated successfully")
+
+            if previous:
+                self._save(
+                    holdings,
+                    removed=list(previous.values()),
+                    added=[dict(by_id[transaction_id]) for transaction_id in previous]
+                )
+
+            return messages
+
+
+
+def get_holdings_manager(portfolio_id: Optional[str]=None):
+    """
+    Returns the holdings store of a portfolio (the default portfolio when portfolio_id
+    is None), using the backend selected by the HOLDINGS_BACKEND environment variable.
+    "json" (default) keeps everything in holdings.json, "journal" appends mutations
+    to holdings.json.journal and compacts them into holdings.json periodically, and
+    "sqlite" uses the indexed SQLite store (see functions/sqlite_holdings.py for the
+    one-shot migration).
+    """
+    from functions.portfolios import DEFAULT_PORTFOLIO_ID, portfolio_file
+
+    portfolio_id = portfolio_id or DEFAULT_PORTFOLIO_ID
+    backend = os.getenv("HOLDINGS_BACKEND", "json").lower()
+
+    if backend == "sqlite":
+        from functions.sqlite_holdings import SQLiteHoldingsManager
+        return SQLiteHoldingsManager(portfolio_file(portfolio_id, "holdings.db"))
+
+    if backend == "journal":
+        from functions.journal_holdings import JournaledHoldingsManager
+        return JournaledHoldingsManager(portfolio_file(portfolio_id, "holdings.json"))
+
+    return HoldingsManager(portfolio_file(portfolio_id, "holdings.json"))
@@ -0,0 +1,97 @@
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+from functions.symbol_index import MATCH_THRESHOLD, get_symbol_index, normalize_name, trigrams
+
+
+class HoldingsNameIndex:
+    """
+    In-memory index of the tickers and names of one portfolio's positions.
+
+    match tries, in order, the ticker itself, the exact (normalized) name, names that
+    contain every word of the query ("Reliance" -> "Reliance Industries Limited") and
+    finally a trigram match, and returns the tickers of the first rule that matches.
+    """
+    def __init__(self, positions: List[dict]):
+        self.names: Dict[str, str] = {}
+        self._words: Dict[str, set] = {}
+        self._postings: Dict[str, set] = defaultdict(set)
+        self._gram_counts: Dict[str, int] = {}
+
+        for position in positions:
+            ticker = position["ticker"]
+            name = normalize_name(position.get("name") or ticker)
+            self.names[ticker] = position.get("name") or ticker
+            self._words[ticker] = set(name.split())
+
+            grams = trigrams(name)
+            self._gram_counts[ticker] = len(grams)
+            for gram in grams:
+                self._postings[gram].add(ticker)
+
+
+
+    def match(self, company: str) -> List[str]:
+        symbol = company.strip().upper()
+        if symbol in self.names:
+            return [symbol]
+
+        key = normalize_name(company)
+        query_words = set(key.split())
+
+        exact = [ticker for ticker, words in self._words.items() if words == query_words]
+        if exact:
+            return exact
+
+        containing = [ticker for ticker, words in self._words.items() if query_words and query_words <= words]
+        if containing:
+            return containing
+
+        query_grams = trigrams(key)
+        overlaps = Counter()
+        for gram in query_grams:
+            overlaps.update(self._postings.get(gram, ()))
+
+        return [
+            ticker for ticker, overlap in overlaps.most_common()
+            if 2 * overlap / (len(query_grams) + self._gram_counts[ticker]) >= MATCH_THRESHOLD
+        ]
+
+
+# One index per holdings store, rebuilt when the store's files change.
+_name_indexes: Dict[str, Tuple[tuple, HoldingsNameIndex]] = {}
+_name_indexes_lock = threading.Lock()
+
+
+def get_name_index(manager) -> HoldingsNameIndex:
+    signature = manager._signature()
+
+    with _name_indexes_lock:
+        entry = _name_indexes.get(manager.filepath)
+    if entry and entry[0] == signature:
+        return entry[1]
+
+    index = HoldingsNameIndex(manager.list_positions())
+    with _name_indexes_lock:
+        _name_indexes[manager.filepath] = (signature, index)
+    return index
+
+
+def match_holdings(manager, company: str) -> List[dict]:
+    """
+    Positions of the portfolio behind manager that match company, as search results in
+    the format returned by tools.ticker.get_ticker. A single result means the company
+    is unambiguous within the portfolio and needs no network search or prompt.
+    """
+    index = get_name_index(manager)
+    symbol_index = get_symbol_index()
+
+    matches = []
+    for ticker in index.match(company):
+        matches.append({
+            **(symbol_index.get(ticker) or {}),
+            "symbol": ticker,
+            "longname": index.names[ticker]
+        })
+    return matches
@@ -0,0 +1,213 @@
+import json
+import os
+from typing import List, Dict
+
+from functions.holding_functions import HoldingsManager, DEFAULT_HOLDINGS_PATH, _file_signature, _update_fields
+from functions.file_lock import atomic_write_json
+
+
+class JournaledHoldingsManager(HoldingsManager):
+    """
+    Holdings store that appends every mutation to a journal next to the snapshot
+    (holdings.json) instead of rewriting the whole file.
+
+    The current holdings are the snapshot with the journal replayed on top. Once the
+    journal grows past compact_threshold_bytes it is folded into a new snapshot.
+    Journal operations are idempotent, so a crash between writing the snapshot and
+    truncating the journal only causes already-applied records to be replayed again.
+    """
+
+    def __init__(self, filepath: str=DEFAULT_HOLDINGS_PATH, compact_threshold_bytes: int=1_000_000):
+        super().__init__(filepath)
+        self.journal_path = filepath + ".journal"
+        self.compact_threshold_bytes = compact_threshold_bytes
+
+
+
+    def _signature(self) -> tuple:
+        return (_file_signature(self.filepath), _file_signature(self.journal_path))
+
+
+
+    def _read(self) -> List[Dict]:
+        holdings = super()._read()
+        if not os.path.exists(self.journal_path):
+            return holdings
+
+        with open(self.journal_path, "r") as f:
+            lines = f.readlines()
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A record torn by a crash mid-append was never acknowledged; skip it.
+                continue
+
+        return self._replay(holdings, records)
+
+
+
+    @staticmethod
+    def _replay(holdings: List[Dict], records: List[Dict]) -> List[Dict]:
+        by_id = {h["transaction_id"]: h for h in holdings}
+
+        for record in records:
+            op = record["op"]
+            if op == "add":
+                holding = record["holding"]
+                if holding["transaction_id"] not in by_id:
+                    holding = dict(holding)
+                    holdings.append(holding)
+                    by_id[holding["transaction_id"]] = holding
+            elif op == "update":
+                h = by_id.get(record["transaction_id"])
+                if h is not None:
+                    h.update(record["fields"])
+            elif op == "delete_transaction_id":
+                if by_id.pop(record["transaction_id"], None) is not None:
+                    holdings = [h for h in holdings if h["transaction_id"] != record["transaction_id"]]
+            elif op == "delete_ticker":
+                holdings = [h for h in holdings if h["ticker"] != record["ticker"]]
+                by_id = {h["transaction_id"]: h for h in holdings}
+            elif op == "clear":
+                holdings = []
+                by_id = {}
+
+        return holdings
+
+
+
+    def _append(self, *records: dict, removed: List[dict]=(), added: List[dict]=()):
+        with self._lock():
+            cached = self._cached(self._signature())
+            positions = self._rolled_positions(removed, added)
+
+            with open(self.journal_path, "ab+") as f:
+                # Start on a fresh line if the previous append was torn by a crash.
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                f.write("".join(json.dumps(record) + "\n" for record in records).encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Roll our own write forward in the shared cache instead of re-reading the files.
+            if cached is not None:
+                self._remember(self._signature(), self._replay([dict(h) for h in cached], list(records)), positions)
+
+            if os.path.getsize(self.journal_path) >= self.compact_threshold_bytes:
+                self.compact()
+
+
+
+    def compact(self):
+        """Folds the journal into a fresh snapshot and truncates the journal."""
+        with self._lock():
+            holdings = self._load()
+            positions = self._cached_positions(self._signature())
+
+            atomic_write_json(self.filepath, holdings)
+
+            with open(self.journal_path, "w") as f:
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._remember(self._signature(), holdings, positions)
+
+
+
+    def add_holding(self, holding: dict) -> str:
+        self._append({"op": "add", "holding": holding}, added=[holding])
+
+        return "Holdings have been added successfully to demat account"
+
+
+
+    def add_holdings(self, new_holdings: List[dict]) -> str:
+        self._append(*({"op": "add", "holding": holding} for holding in new_holdings), added=new_holdings)
+
+        return f"{len(new_holdings)} holdings have been added successfully to demat account"
+
+
+
+    def clear_all_holdings(self):
+        with self._lock():
+            # Every lot goes, so the position index has to drop them all too.
+            self._append({"op": "clear"}, removed=self._load())
+
+        return "All holdings have been cleared successfully from demat account"
+
+
+
+    def delete_holdings_by_transaction_ids(self, transaction_ids: List[str]) -> List[str]:
+        with self._lock():
+            wanted = set(transaction_ids)
+            removed = [h for h in self._load() if h["transaction_id"] in wanted]
+            deleted = {h["transaction_id"] for h in removed}
+
+            if removed:
+                self._append(
+                    *({"op": "delete_transaction_id", "transaction_id": h["transaction_id"]} for h in removed),
+                    removed=removed
+                )
+
+            return [
+                f"holding with Transaction ID {transaction_id} deleted successfully" if transaction_id in deleted
+                else f"holding with Transaction ID {transaction_id} not found!"
+                for transaction_id in transaction_ids
+            ]
+
+
+
+    def delete_holdings_by_tickers(self, tickers: List[str]) -> List[str]:
+        with self._lock():
+            wanted = set(tickers)
+            removed = [h for h in self._load() if h["ticker"] in wanted]
+            deleted = {h["ticker"] for h in removed}
+
+            if removed:
+                self._append(
+                    *({"op": "delete_ticker", "ticker": ticker} for ticker in dict.fromkeys(tickers) if ticker in deleted),
+                    removed=removed
+                )
+
+            return [
+                f"Holdings with ticker '{ticker}' deleted successfully" if ticker in deleted
+                else f"holding with ticker '{ticker}' not found!"
+                for ticker in tickers
+            ]
+
+
+
+    def update_holdings(self, updates: List[dict]) -> List[str]:
+        with self._lock():
+            by_id = {h["transaction_id"]: h for h in self._load()}
+            previous = {}
+            records = []
+            messages = []
+
+            for update in updates:
+                transaction_id = update["transaction_id"]
+                h = by_id.get(transaction_id)
+                if h is None:
+                    messages.append(f"Holding with Transaction ID {transaction_id} could not be updated")
+                    continue
+
+                fields = _update_fields(update)
+                if fields:
+                    previous.setdefault(transaction_id, dict(h))
+                    h.update(fields)
+                    records.append({"op": "update", "transaction_id": transaction_id, "fields": fields})
+                messages.append(f"Holding with Transaction ID {transaction_id} updated successfully")
+
+            if records:
+                self._append(
+                    *records,
+                    removed=list(previous.values()),
+                    added=[dict(by_id[transaction_id]) for transaction_id in previous]
+                )
+
+            return messages
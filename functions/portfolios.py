@@ -0,0 +1,50 @@
+import os
+import re
+from typing import List
+
+from functions.holding_functions import DEFAULT_HOLDINGS_PATH
+
+DEFAULT_PORTFOLIO_ID = "default"
+
+# DEFAULT_HOLDINGS_PATH is a Windows path; elsewhere fall back to the repo's Database/ folder.
+DATABASE_DIR = os.path.dirname(DEFAULT_HOLDINGS_PATH) or "Database"
+PORTFOLIOS_DIR = os.path.join(DATABASE_DIR, "portfolios")
+
+_PORTFOLIO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def validate_portfolio_id(portfolio_id: str) -> str:
+    """Portfolio ids become directory names, so only allow a safe character set."""
+    if not portfolio_id or not _PORTFOLIO_ID_PATTERN.match(portfolio_id):
+        raise ValueError(f"Invalid portfolio id '{portfolio_id}'. Use letters, digits, '-' or '_' (max 64 characters).")
+    return portfolio_id
+
+
+def portfolio_dir(portfolio_id: str=DEFAULT_PORTFOLIO_ID) -> str:
+    """
+    Directory holding one portfolio's files. The default portfolio keeps the original
+    Database/ layout; every other portfolio gets its own Database/portfolios/<id>/ folder,
+    so each one is loaded, cached and locked independently.
+    """
+    validate_portfolio_id(portfolio_id)
+
+    if portfolio_id == DEFAULT_PORTFOLIO_ID:
+        return DATABASE_DIR
+
+    directory = os.path.join(PORTFOLIOS_DIR, portfolio_id)
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def portfolio_file(portfolio_id: str, filename: str) -> str:
+    return os.path.join(portfolio_dir(portfolio_id), filename)
+
+
+def list_portfolios() -> List[str]:
+    portfolios = [DEFAULT_PORTFOLIO_ID]
+    if os.path.isdir(PORTFOLIOS_DIR):
+        portfolios += sorted(
+            name for name in os.listdir(PORTFOLIOS_DIR)
+            if os.path.isdir(os.path.join(PORTFOLIOS_DIR, name)) and _PORTFOLIO_ID_PATTERN.match(name)
+        )
+    return portfolios
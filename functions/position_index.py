@@ -0,0 +1,86 @@
+from typing import List, Dict
+
+POSITION_FIELDS = ["ticker", "quantity", "total_cost", "weighted_avg_cost", "name", "sector", "industry", "currency"]
+
+
+class PositionIndex:
+    """
+    Per-ticker aggregate of holding lots: total quantity, total cost and the
+    name/sector/industry/currency of the position.
+
+    Lots are folded in and out one at a time, so the holdings stores can keep the
+    index current on every write instead of re-aggregating all lots for each report.
+    """
+
+    def __init__(self, positions: Dict[str, dict]=None):
+        self.positions = positions if positions is not None else {}
+
+
+
+    @classmethod
+    def from_holdings(cls, holdings: List[dict]) -> "PositionIndex":
+        index = cls()
+        for holding in holdings:
+            index.add(holding)
+        return index
+
+
+
+    def copy(self) -> "PositionIndex":
+        return PositionIndex({ticker: dict(position) for ticker, position in self.positions.items()})
+
+
+
+    def add(self, holding: dict):
+        quantity = holding.get("quantity", 0) or 0
+        price = holding.get("price", 0) or 0
+        position = self.positions.get(holding["ticker"])
+
+        if position is None:
+            self.positions[holding["ticker"]] = {
+                "quantity": quantity,
+                "total_cost": price * quantity,
+                "lots": 1,
+                "name": holding.get("name"),
+                "sector": holding.get("sector"),
+                "industry": holding.get("industry"),
+                "currency": holding.get("currency")
+            }
+        else:
+            position["quantity"] += quantity
+            position["total_cost"] += price * quantity
+            position["lots"] += 1
+
+
+
+    def remove(self, holding: dict):
+        position = self.positions.get(holding["ticker"])
+        if position is None:
+            return
+
+        position["lots"] -= 1
+        if position["lots"] <= 0:
+            del self.positions[holding["ticker"]]
+            return
+
+        quantity = holding.get("quantity", 0) or 0
+        position["quantity"] -= quantity
+        position["total_cost"] -= (holding.get("price", 0) or 0) * quantity
+
+
+
+    def rows(self) -> List[dict]:
+        rows = []
+        for ticker, position in self.positions.items():
+            quantity = position["quantity"]
+            rows.append({
+                "ticker": ticker,
+                "quantity": quantity,
+                "total_cost": position["total_cost"],
+                "weighted_avg_cost": position["total_cost"] / quantity if quantity else 0.0,
+                "name": position["name"],
+                "sector": position["sector"],
+                "industry": position["industry"],
+                "currency": position["currency"]
+            })
+        return rows
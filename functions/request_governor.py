@@ -0,0 +1,255 @@
+import random
+import re
+import threading
+import time
+from typing import Dict, Tuple
+
+# Requests per second and burst size for each family of Yahoo endpoints. Families are
+# limited independently, since Yahoo throttles e.g. searches long before quote requests.
+YAHOO_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "quote": (4.0, 8),
+    "history": (2.0, 4),
+    "fundamentals": (2.0, 4),
+    "search": (1.0, 3),
+    "screener": (0.5, 2),
+    "industry": (1.0, 3)
+}
+
+# Requests in flight at once, over all families.
+YAHOO_MAX_CONCURRENT_REQUESTS = 4
+
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+# Consecutive calls of a family that end throttled or failed (after their own retries)
+# that open its circuit, and how long it stays open before one trial call is let through.
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+# yahooquery reports throttling as a string (or a dict of strings) instead of raising;
+# yfinance raises YFRateLimitError; both mention one of these.
+_THROTTLED = re.compile(r"429|too many requests|rate ?limit|invalid crumb|unauthorized", re.IGNORECASE)
+_TRANSIENT_ERRORS = ("Timeout", "ConnectionError", "RateLimit")
+
+
+class CircuitOpenError(RuntimeError):
+    """Requests to an endpoint family are paused after repeated throttling."""
+
+
+def is_throttled(result=None, error: Exception=None) -> bool:
+    """Whether a response (or the exception raised instead) means Yahoo is throttling or unreachable."""
+    if error is not None:
+        return any(name in type(error).__name__ for name in _TRANSIENT_ERRORS) or bool(_THROTTLED.search(str(error)))
+    if isinstance(result, str):
+        return bool(_THROTTLED.search(result))
+    if isinstance(result, dict):
+        # One throttled symbol is enough: the rest of a batch may have been answered.
+        return any(isinstance(value, str) and _THROTTLED.search(value) for value in result.values())
+    return False
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+
+
+    def acquire(self):
+        """Blocks until a token is available and takes it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Closed while calls succeed. After threshold consecutive failed calls it opens and
+    rejects calls for cooldown seconds, then lets a single trial call through (half
+    open): success closes it again, failure re-opens it.
+    """
+    def __init__(self, threshold: int=BREAKER_THRESHOLD, cooldown: float=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+
+
+    def before_call(self, family: str) -> bool:
+        """Raises CircuitOpenError while open. Returns True when this call is the half-open trial."""
+        with self._lock:
+            if self.opened_at is None:
+                return False
+
+            remaining = self.opened_at + self.cooldown - time.monotonic()
+            if remaining > 0 or self._trial_running:
+                raise CircuitOpenError(f"Yahoo Finance {family} requests are paused after repeated throttling; retry in {max(remaining, 0):.0f}s")
+            self._trial_running = True
+            return True
+
+
+
+    def record(self, success: bool):
+        with self._lock:
+            self._trial_running = False
+            if success:
+                self.failures = 0
+                self.opened_at = None
+                return
+
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.opened_at is not None
+
+
+class RequestGovernor:
+    """
+    Outbound request policy for one remote service: a token bucket and a circuit breaker
+    per endpoint family, a cap on requests in flight, and retries with full-jitter
+    exponential backoff when a response says the service is throttling.
+    """
+    def __init__(self, rate_limits: Dict[str, Tuple[float, int]], max_concurrent: int, max_retries: int=MAX_RETRIES):
+        self.max_retries = max_retries
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._buckets = {family: TokenBucket(rate, burst) for family, (rate, burst) in rate_limits.items()}
+        self._breakers = {family: CircuitBreaker() for family in rate_limits}
+
+        self.requests = 0
+        self.retries = 0
+        self._stats_lock = threading.Lock()
+
+
+
+    def _send(self, family: str, attempt: int, fetch, *args, **kwargs):
+        """One request under the family's rate limit and the in-flight cap; returns (result, error)."""
+        self._buckets[family].acquire()
+
+        result, error = None, None
+        with self._slots:
+            try:
+                result = fetch(*args, **kwargs)
+            except Exception as e:
+                error = e
+
+        with self._stats_lock:
+            self.requests += 1
+            self.retries += attempt > 0
+        return result, error
+
+
+
+    def _backoff(self, attempt: int):
+        time.sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)))
+
+
+
+    def call(self, family: str, fetch, *args, **kwargs):
+        """
+        Runs fetch(*args, **kwargs) under the family's limits. A throttled response is
+        retried; once retries run out the last response is returned (or its exception
+        raised) as is. Raises CircuitOpenError while the family's circuit is open.
+
+        The circuit breaker sees the outcome of the whole call, not of each attempt:
+        a call fails when it is still throttled after its retries or raises.
+        """
+        breaker = self._breakers[family]
+        trial = breaker.before_call(family)
+
+        for attempt in range(self.max_retries + 1):
+            result, error = self._send(family, attempt, fetch, *args, **kwargs)
+            throttled = is_throttled(result, error)
+
+            # A half-open trial gets a single attempt, so the circuit is decided quickly.
+            if not throttled or trial or attempt == self.max_retries or breaker.is_open():
+                break
+            self._backoff(attempt)
+
+        breaker.record(error is None and not throttled)
+
+        if error is not None:
+            raise error
+        return result
+
+
+
+    def call_batch(self, family: str, symbols, fetch):
+        """
+        Runs fetch(symbols) for a multi-symbol request answering {symbol: value}.
+
+        yahooquery sends one HTTP request per symbol of a batch, so part of a batch can
+        be throttled while the rest is answered. Only the throttled symbols are
+        requested again, and their answers merged into the result; a symbol still
+        throttled after the retries keeps its error message. A response that is not a
+        dict is handled as in call().
+        """
+        breaker = self._breakers[family]
+        trial = breaker.before_call(family)
+
+        merged = {}
+        pending = list(symbols)
+
+        for attempt in range(self.max_retries + 1):
+            result, error = self._send(family, attempt, fetch, pending)
+
+            if isinstance(result, dict):
+                merged.update(result)
+                pending = [symbol for symbol in pending if is_throttled(result.get(symbol))]
+                throttled = bool(pending)
+            else:
+                throttled = is_throttled(result, error)
+
+            if not throttled or trial or attempt == self.max_retries or breaker.is_open():
+                break
+            self._backoff(attempt)
+
+        breaker.record(error is None and not throttled)
+
+        if merged:
+            return merged
+        if error is not None:
+            raise error
+        return result
+
+
+
+    def stats(self) -> Dict[str, object]:
+        with self._stats_lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "open_circuits": [family for family, breaker in self._breakers.items() if breaker.is_open()]
+            }
+
+
+yahoo_governor = RequestGovernor(YAHOO_RATE_LIMITS, YAHOO_MAX_CONCURRENT_REQUESTS)
+
+
+def yahoo_request(family: str, fetch, *args, **kwargs):
+    """Runs one Yahoo Finance request (fetch(*args, **kwargs)) through the shared governor."""
+    return yahoo_governor.call(family, fetch, *args, **kwargs)
+
+
+def yahoo_batch_request(family: str, symbols, fetch):
+    """Runs one multi-symbol Yahoo Finance request (fetch(symbols)) through the shared governor."""
+    return yahoo_governor.call_batch(family, symbols, fetch)
@@ -0,0 +1,318 @@
+import json
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+from typing import List, Dict, Optional
+
+from functions.holding_functions import DEFAULT_HOLDINGS_PATH, _file_signature, _update_fields
+from functions.portfolios import DEFAULT_PORTFOLIO_ID, portfolio_file
+
+DEFAULT_SQLITE_PATH = os.path.splitext(DEFAULT_HOLDINGS_PATH)[0] + ".db"
+
+HOLDING_COLUMNS = [
+    "transaction_id",
+    "name",
+    "price",
+    "quantity",
+    "sector",
+    "industry",
+    "ticker",
+    "quoteType",
+    "transaction_time",
+    "currency",
+    "exchange"
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS holdings (
+    transaction_id TEXT PRIMARY KEY,
+    name TEXT,
+    price NUMERIC,
+    quantity NUMERIC,
+    sector TEXT,
+    industry TEXT,
+    ticker TEXT NOT NULL,
+    quoteType TEXT,
+    transaction_time TEXT,
+    currency TEXT,
+    exchange TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_holdings_ticker ON holdings (ticker);
+CREATE INDEX IF NOT EXISTS idx_holdings_sector ON holdings (sector);
+
+CREATE TABLE IF NOT EXISTS positions (
+    ticker TEXT PRIMARY KEY,
+    quantity NUMERIC NOT NULL DEFAULT 0,
+    total_cost NUMERIC NOT NULL DEFAULT 0,
+    lots INTEGER NOT NULL DEFAULT 0,
+    name TEXT,
+    sector TEXT,
+    industry TEXT,
+    currency TEXT
+);
+
+CREATE TRIGGER IF NOT EXISTS holdings_position_insert AFTER INSERT ON holdings
+BEGIN
+    INSERT INTO positions (ticker, quantity, total_cost, lots, name, sector, industry, currency)
+    VALUES (NEW.ticker, COALESCE(NEW.quantity, 0), COALESCE(NEW.quantity, 0) * COALESCE(NEW.price, 0), 1, NEW.name, NEW.sector, NEW.industry, NEW.currency)
+    ON CONFLICT (ticker) DO UPDATE SET
+        quantity = quantity + excluded.quantity,
+        total_cost = total_cost + excluded.total_cost,
+        lots = lots + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS holdings_position_delete AFTER DELETE ON holdings
+BEGIN
+    UPDATE positions SET
+        quantity = quantity - COALESCE(OLD.quantity, 0),
+        total_cost = total_cost - COALESCE(OLD.quantity, 0) * COALESCE(OLD.price, 0),
+        lots = lots - 1
+    WHERE ticker = OLD.ticker;
+    DELETE FROM positions WHERE ticker = OLD.ticker AND lots <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS holdings_position_update AFTER UPDATE OF quantity, price ON holdings
+BEGIN
+    UPDATE positions SET
+        quantity = quantity - COALESCE(OLD.quantity, 0) + COALESCE(NEW.quantity, 0),
+        total_cost = total_cost - COALESCE(OLD.quantity, 0) * COALESCE(OLD.price, 0) + COALESCE(NEW.quantity, 0) * COALESCE(NEW.price, 0)
+    WHERE ticker = NEW.ticker;
+END;
+"""
+
+# Backfills the positions table for databases created before it existed.
+BACKFILL_POSITIONS_SQL = """
+INSERT INTO positions (ticker, quantity, total_cost, lots, name, sector, industry, currency)
+SELECT ticker, SUM(COALESCE(quantity, 0)), SUM(COALESCE(quantity, 0) * COALESCE(price, 0)), COUNT(*), MIN(name), MIN(sector), MIN(industry), MIN(currency)
+FROM holdings
+GROUP BY ticker
+"""
+
+INSERT_SQL = f"INSERT INTO holdings ({', '.join(HOLDING_COLUMNS)}, extra) VALUES ({', '.join('?' * (len(HOLDING_COLUMNS) + 1))})"
+
+
+def _holding_to_row(holding: dict) -> tuple:
+    extra = {k: v for k, v in holding.items() if k not in HOLDING_COLUMNS}
+    return tuple(holding.get(column) for column in HOLDING_COLUMNS) + (json.dumps(extra) if extra else None,)
+
+
+def _row_to_holding(row: sqlite3.Row) -> dict:
+    holding = {column: row[column] for column in HOLDING_COLUMNS}
+    if row["extra"]:
+        holding.update(json.loads(row["extra"]))
+    return holding
+
+
+class SQLiteHoldingsManager:
+    """
+    Embedded SQLite storage for holdings with the same method surface as HoldingsManager.
+
+    Holdings are indexed on transaction_id (primary key), ticker and sector, so point
+    reads and single row updates do not scan or rewrite the whole book.
+    """
+
+    def __init__(self, filepath: str=DEFAULT_SQLITE_PATH):
+        self.filepath = filepath
+        self._ensure_schema()
+
+
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.filepath, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+
+    def _signature(self) -> tuple:
+        """Changes whenever a transaction commits, via the main file or its WAL."""
+        return (_file_signature(self.filepath), _file_signature(self.filepath + "-wal"))
+
+
+
+    def _ensure_schema(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            if conn.execute("SELECT 1 FROM positions LIMIT 1").fetchone() is None:
+                conn.execute(BACKFILL_POSITIONS_SQL)
+
+
+
+    def add_holding(self, holding: dict) -> str:
+        with self._connect() as conn:
+            conn.execute(INSERT_SQL, _holding_to_row(holding))
+
+        return "Holdings have been added successfully to demat account"
+
+
+
+    def add_holdings(self, new_holdings: List[dict]) -> str:
+        with self._connect() as conn:
+            conn.executemany(INSERT_SQL, [_holding_to_row(h) for h in new_holdings])
+
+        return f"{len(new_holdings)} holdings have been added successfully to demat account"
+
+
+
+    def list_holdings(self) -> List[dict]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM holdings ORDER BY rowid").fetchall()
+        return [_row_to_holding(row) for row in rows]
+
+
+
+    def list_positions(self) -> List[dict]:
+        """Aggregated position per ticker, kept current by triggers on the holdings table."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM positions ORDER BY ticker").fetchall()
+
+        return [
+            {
+                "ticker": row["ticker"],
+                "quantity": row["quantity"],
+                "total_cost": row["total_cost"],
+                "weighted_avg_cost": row["total_cost"] / row["quantity"] if row["quantity"] else 0.0,
+                "name": row["name"],
+                "sector": row["sector"],
+                "industry": row["industry"],
+                "currency": row["currency"]
+            }
+            for row in rows
+        ]
+
+
+
+    def clear_all_holdings(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM holdings")
+
+        return "All holdings have been cleared successfully from demat account"
+
+
+
+    def get_holding_by_transaction_id(self, transaction_id: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM holdings WHERE transaction_id = ?", (transaction_id,)).fetchone()
+        return _row_to_holding(row) if row else None
+
+
+
+    def get_holding_by_ticker(self, ticker: str) -> List:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM holdings WHERE ticker = ? ORDER BY rowid", (ticker,)).fetchall()
+        return [_row_to_holding(row) for row in rows]
+
+
+
+    def delete_holding_by_transaction_id(self, transaction_id: str) -> str:
+        return self.delete_holdings_by_transaction_ids([transaction_id])[0]
+
+
+
+    def delete_holdings_by_transaction_ids(self, transaction_ids: List[str]) -> List[str]:
+        """Deletes many holdings in one transaction. Returns one message per transaction ID."""
+        deleted = set()
+        with self._connect() as conn:
+            for transaction_id in transaction_ids:
+                if conn.execute("DELETE FROM holdings WHERE transaction_id = ?", (transaction_id,)).rowcount:
+                    deleted.add(transaction_id)
+
+        return [
+            f"holding with Transaction ID {transaction_id} deleted successfully" if transaction_id in deleted
+            else f"holding with Transaction ID {transaction_id} not found!"
+            for transaction_id in transaction_ids
+        ]
+
+
+
+    def delete_holding_by_ticker(self, ticker: str) -> str:
+        return self.delete_holdings_by_tickers([ticker])[0]
+
+
+
+    def delete_holdings_by_tickers(self, tickers: List[str]) -> List[str]:
+        """Deletes every lot of many tickers in one transaction. Returns one message per ticker."""
+        deleted = set()
+        with self._connect() as conn:
+            for ticker in tickers:
+                if conn.execute("DELETE FROM holdings WHERE ticker = ?", (ticker,)).rowcount:
+                    deleted.add(ticker)
+
+        return [
+            f"Holdings with ticker '{ticker}' deleted successfully" if ticker in deleted
+            else f"holding with ticker '{ticker}' not found!"
+            for ticker in tickers
+        ]
+
+
+
+    def update_holding(self, transaction_id: str, updated_quantity: int, updated_price: int) -> str:
+        return self.update_holdings([{
+            "transaction_id": transaction_id,
+            "updated_quantity": updated_quantity,
+            "updated_price": updated_price
+        }])[0]
+
+
+
+    def update_holdings(self, updates: List[dict]) -> List[str]:
+        """Applies many updates in one transaction. Returns one message per update."""
+        messages = []
+        with self._connect() as conn:
+            for update in updates:
+                transaction_id = update["transaction_id"]
+                fields = _update_fields(update)
+
+                if fields:
+                    updated = conn.execute(
+                        f"UPDATE holdings SET {', '.join(f'{column} = ?' for column in fields)} WHERE transaction_id = ?",
+                        list(fields.values()) + [transaction_id]
+                    ).rowcount
+                else:
+                    updated = conn.execute("SELECT 1 FROM holdings WHERE transaction_id = ?", (transaction_id,)).fetchone() is not None
+
+                if updated:
+                    messages.append(f"Holding with Transaction ID {transaction_id} updated successfully")
+                else:
+                    messages.append(f"Holding with Transaction ID {transaction_id} could not be updated")
+
+        return messages
+
+
+
+def migrate_json_to_sqlite(portfolio_id: str=DEFAULT_PORTFOLIO_ID, json_path: Optional[str]=None, db_path: Optional[str]=None) -> int:
+    """
+    One-shot import of a portfolio's holdings.json into its SQLite store, i.e. the
+    holdings.db that HOLDINGS_BACKEND=sqlite opens for that portfolio. Holdings whose
+    transaction_id already exists in the database are skipped, so running the
+    migration twice is harmless. Returns the number of rows inserted.
+    """
+    json_path = json_path or portfolio_file(portfolio_id, "holdings.json")
+    db_path = db_path or portfolio_file(portfolio_id, "holdings.db")
+
+    with open(json_path, "r") as f:
+        holdings: List[Dict] = json.load(f)
+
+    manager = SQLiteHoldingsManager(db_path)
+
+    with manager._connect() as conn:
+        # rowcount, unlike total_changes, leaves out the position-index trigger writes.
+        inserted = conn.executemany(INSERT_SQL.replace("INSERT", "INSERT OR IGNORE", 1), [_holding_to_row(h) for h in holdings]).rowcount
+
+    return inserted
+
+
+
+if __name__ == "__main__":
+    # Usage: python -m functions.sqlite_holdings [portfolio_id]
+    portfolio_id = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PORTFOLIO_ID
+    count = migrate_json_to_sqlite(portfolio_id)
+    print(f"Migrated {count} holdings to {portfolio_file(portfolio_id, 'holdings.db')}")
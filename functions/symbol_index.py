@@ -0,0 +1,213 @@
+import json
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from functions.file_lock import FileLock, atomic_write_json
+from functions.portfolios import DATABASE_DIR, list_portfolios
+
+SYMBOL_INDEX_PATH = os.path.join(DATABASE_DIR, "symbols.json")
+
+# Dice similarity (0-1) of the query's and a name's trigrams needed for a local match.
+# High enough that "Meta" does not resolve to a stored "Metal Corp" (0.73) instead of
+# going to the network, while spacing, punctuation and legal suffixes still match.
+MATCH_THRESHOLD = 0.8
+
+# The search result fields kept for each symbol; get_ticker's callers only read these.
+QUOTE_FIELDS = ["symbol", "longname", "shortname", "exchange", "exchDisp", "quoteType"]
+
+# Legal-form words that say nothing about which company is meant ("Apple" vs "Apple Inc.").
+_NAME_SUFFIXES = {"inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited", "plc", "llc", "sa", "ag", "nv", "se", "the"}
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str) -> str:
+    words = _NON_ALPHANUMERIC.sub(" ", (name or "").lower().replace("&", " and ")).split()
+    kept = [word for word in words if word not in _NAME_SUFFIXES]
+    return " ".join(kept or words)
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SymbolIndex:
+    """
+    Local directory of symbols (names, exchange and quote type, in yahooquery search
+    result format) and of the searches that found them, stored in Database/symbols.json.
+
+    lookup answers a company name from past searches or from a trigram match against the
+    stored names and symbols, and returns None when nothing is close enough, so the
+    caller only has to search Yahoo on a miss.
+    """
+    def __init__(self, path: str=SYMBOL_INDEX_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._quotes: Dict[str, dict] = {}
+        self._searches: Dict[str, List[str]] = {}
+
+        # Trigram -> ids of the names containing it; _names[id] = (symbol, trigram count).
+        self._postings: Dict[str, set] = defaultdict(set)
+        self._names: List[tuple] = []
+        self._indexed = set()
+        # Ties between matches keep the order symbols were first stored in, i.e. Yahoo's ranking.
+        self._order: Dict[str, int] = {}
+
+        if os.path.exists(self.path):
+            self._load()
+        else:
+            self._seed_from_holdings()
+
+
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # A damaged index only costs network searches; it is rewritten on the next save.
+            data = {}
+
+        self._searches = data.get("searches", {})
+        for quote in data.get("quotes", {}).values():
+            self._add(quote)
+
+
+
+    def _seed_from_holdings(self):
+        from functions.holding_functions import get_holdings_manager
+
+        quotes = []
+        for portfolio_id in list_portfolios():
+            for holding in get_holdings_manager(portfolio_id).list_holdings():
+                quotes.append({
+                    "symbol": holding.get("ticker"),
+                    "longname": holding.get("name"),
+                    "exchange": holding.get("exchange"),
+                    "exchDisp": holding.get("exchange"),
+                    "quoteType": holding.get("quoteType")
+                })
+
+        if quotes:
+            self.add_quotes(quotes)
+
+
+
+    def _save(self):
+        with FileLock(self.path):
+            atomic_write_json(self.path, {"quotes": self._quotes, "searches": self._searches}, indent=None)
+
+
+
+    def _add(self, quote: dict) -> bool:
+        symbol = quote.get("symbol")
+        if not symbol:
+            return False
+
+        stored = self._quotes.get(symbol, {})
+        updated = {**stored, **{field: quote[field] for field in QUOTE_FIELDS if quote.get(field) is not None}}
+        if updated == stored:
+            return False
+
+        if symbol not in self._order:
+            self._order[symbol] = len(self._order)
+        self._quotes[symbol] = updated
+        for name in {normalize_name(symbol), normalize_name(updated.get("longname")), normalize_name(updated.get("shortname"))}:
+            if not name or (symbol, name) in self._indexed:
+                continue
+            self._indexed.add((symbol, name))
+            grams = trigrams(name)
+            name_id = len(self._names)
+            self._names.append((symbol, len(grams)))
+            for gram in grams:
+                self._postings[gram].add(name_id)
+        return True
+
+
+
+    def add_quotes(self, quotes: List[dict]):
+        """Adds or updates symbols, e.g. from a bulk refresh."""
+        with self._lock:
+            if any([self._add(quote) for quote in quotes]):
+                self._save()
+
+
+
+    def remember(self, query: str, quotes: List[dict]):
+        """Stores the results of a network search for query."""
+        with self._lock:
+            symbols = [quote["symbol"] for quote in quotes if quote.get("symbol")]
+            for quote in quotes:
+                self._add(quote)
+            self._searches[normalize_name(query)] = symbols
+            self._save()
+
+
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._quotes)
+
+
+
+    def get(self, symbol: str) -> Optional[dict]:
+        with self._lock:
+            quote = self._quotes.get(symbol)
+            return dict(quote) if quote else None
+
+
+
+    def searched(self, query: str) -> bool:
+        """Whether query was searched on Yahoo before, i.e. lookup answers it with that search's results."""
+        with self._lock:
+            return normalize_name(query) in self._searches
+
+
+
+    def lookup(self, query: str) -> Optional[List[dict]]:
+        """Search results for query from the local index, best match first; None on a miss."""
+        key = normalize_name(query)
+
+        with self._lock:
+            if key in self._searches:
+                return [dict(self._quotes[symbol]) for symbol in self._searches[key] if symbol in self._quotes] or None
+
+            symbol = query.strip().upper()
+            if symbol in self._quotes:
+                return [dict(self._quotes[symbol])]
+
+            query_grams = trigrams(key)
+            overlaps = Counter()
+            for gram in query_grams:
+                overlaps.update(self._postings.get(gram, ()))
+
+            scores = {}
+            for name_id, overlap in overlaps.items():
+                symbol, gram_count = self._names[name_id]
+                score = 2 * overlap / (len(query_grams) + gram_count)
+                if score >= MATCH_THRESHOLD and score > scores.get(symbol, 0):
+                    scores[symbol] = score
+
+            if not scores:
+                return None
+
+            ranked = sorted(scores, key=lambda symbol: (-round(scores[symbol], 6), self._order[symbol]))
+            return [dict(self._quotes[symbol]) for symbol in ranked]
+
+
+_index: Optional[SymbolIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_symbol_index() -> SymbolIndex:
+    """The process-wide SymbolIndex, loaded (or seeded from holdings) on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SymbolIndex()
+    return _index
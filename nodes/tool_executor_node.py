@@ -1,6 +1,7 @@
 from portfolio_analysis_tools.report_generator import generate_portfolio_report
 
 from portfolio_management_tools.database_add import add_to_database
+from portfolio_management_tools.database_bulk_import import bulk_import_to_database
 from portfolio_management_tools.database_update import update_database
 from portfolio_management_tools.database_list import list_database
 from portfolio_management_tools.database_clear import clear_database
@@ -18,31 +19,38 @@ from screener_tools.stock_screener import screen_stocks
 from tools.display_financial_news import get_financial_news
 from tools.any_prompt import display_result_for_unknown_prompts
 
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
+
 from langchain_core.messages import ToolMessage
 
 def execute_tools(state):
     tool_call = state['pending_tool_calls'].pop(0)
     tool_name = tool_call['name']
     tool_args = tool_call['args']
+    portfolio_id = state.get('portfolio_id') or DEFAULT_PORTFOLIO_ID
 
     if tool_name == "add_to_database":
-        result = add_to_database(tool_args.get("company", None), tool_args.get("quantity", None), tool_args.get("price", None))
+        result = add_to_database(tool_args.get("company", None), tool_args.get("quantity", None), tool_args.get("price", None), portfolio_id)
+    elif tool_name == "bulk_import_to_database":
+        result = bulk_import_to_database(tool_args.get("file_path", ""), portfolio_id)
     elif tool_name == "update_database":
-        result = update_database(tool_args.get("transaction_id", ""), tool_args.get("new_quantity", -1), tool_args.get("new_price", -1))
+        # Older calls carry a single update as top-level transaction_id / new_quantity / new_price.
+        updates = tool_args.get("updates") or ([{key: tool_args[key] for key in ("transaction_id", "new_quantity", "new_price") if key in tool_args}] if "transaction_id" in tool_args else [])
+        result = update_database(updates, portfolio_id)
     elif tool_name == "list_database":
-        result = list_database()
+        result = list_database(portfolio_id)
     elif tool_name == "clear_database":
-        result = clear_database()
+        result = clear_database(portfolio_id)
     elif tool_name == "get_by_trans":
-        result = get_by_trans(tool_args.get("transaction_id", ""))
+        result = get_by_trans(tool_args.get("transaction_id", ""), portfolio_id)
     elif tool_name == "get_database_by_name":
-        result = get_database_by_name(tool_args.get("companies", []))
+        result = get_database_by_name(tool_args.get("companies", []), portfolio_id)
     elif tool_name == "delete_database_by_name":
-        result =  delete_database_by_name(tool_args.get("companies", []))
+        result =  delete_database_by_name(tool_args.get("companies", []), portfolio_id)
     elif tool_name == "delete_database_by_trans":
-        result = delete_database_by_trans(tool_args.get("transaction_id", ""))
+        result = delete_database_by_trans(tool_args.get("transaction_ids") or tool_args.get("transaction_id", []), portfolio_id)
     elif tool_name == "generate_portfolio_report":
-        result = generate_portfolio_report()
+        result = generate_portfolio_report(portfolio_id)
     elif tool_name == "get_sector_industry_recommendation":
         result = get_sector_industry_recommendation(state=state, included_sectors=tool_args.get("included_sectors", None), excluded_sectors=tool_args.get("excluded_sectors", None))
     elif tool_name == "specific_stock_analysis":
@@ -1,4 +1,8 @@
-from functions.holding_functions import HoldingsManager
+from functions.holding_functions import get_holdings_manager
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
+from langgraph.prebuilt import InjectedState
+from typing_extensions import Annotated
+from functions.columnar_snapshot import load_positions_frame
 from tools.generate_report import generate_portfolio_report as generate_pdf_report
 import os
 from datetime import datetime
@@ -8,18 +12,18 @@ from rich.columns import Columns
 from rich.prompt import Prompt
 from mappings import currency_full_names
 
-def generate_portfolio_report() -> str:
+def generate_portfolio_report(portfolio_id: Annotated[str, InjectedState("portfolio_id")] = DEFAULT_PORTFOLIO_ID) -> str:
     """
     Generates a PDF report of user's portfolio.
     """
     console = Console()
-    manager = HoldingsManager()
+    manager = get_holdings_manager(portfolio_id)
 
     console.print("Doing portfolio analysis...", style="dim italic")
 
-    my_holdings = manager.list_holdings()
+    my_positions = load_positions_frame(manager)
 
-    if not my_holdings:
+    if my_positions.empty:
         console.print("[bold yellow]⚠️ Your portfolio is currently empty. Cannot generate a report.[/bold yellow]")
         return "Your portfolio is currently empty. Cannot generate a report."
 
@@ -46,7 +50,7 @@ def generate_portfolio_report() -> str:
 
     console.print(f"\nGenerating report with base currency: [bold green]{selected_currency}[/bold green]...")
 
-    folder = "reports"
+    folder = "reports" if portfolio_id == DEFAULT_PORTFOLIO_ID else os.path.join("reports", portfolio_id)
     os.makedirs(folder, exist_ok=True)
 
     now = datetime.now()
@@ -56,7 +60,7 @@ def generate_portfolio_report() -> str:
     filename = f"portfolio_report_{date_str}_{time_str}.pdf"
     output_pdf_path = os.path.join(folder, filename)
 
-    generate_pdf_report(holdings=my_holdings, output_path=output_pdf_path, base_currency=selected_currency)
+    generate_pdf_report(positions=my_positions, output_path=output_pdf_path, base_currency=selected_currency)
 
     success_message = f"✔ Report generated successfully!\n[dim]Saved to: {os.path.abspath(output_pdf_path)}[/dim]"
     console.print(Panel(success_message, style="green", title="[bold]Success[/bold]"))
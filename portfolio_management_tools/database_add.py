@@ -1,15 +1,18 @@
-from functions.holding_functions import HoldingsManager
+from functions.holding_functions import get_holdings_manager
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
+from langgraph.prebuilt import InjectedState
+from typing_extensions import Annotated
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Confirm, IntPrompt
 from tools.ticker import get_ticker
-from tools.financials import get_summary_profile, get_additional_info, get_financial_data
+from tools.financials import get_quote_records
 import uuid
 from datetime import datetime
 from tools.ticker import get_tickers
 
-def add_to_database(company: str, quantity: int, price: float) -> str:
+def add_to_database(company: str, quantity: int, price: float, portfolio_id: Annotated[str, InjectedState("portfolio_id")] = DEFAULT_PORTFOLIO_ID) -> str:
     """
     Add new holdings in to users account
 
@@ -28,26 +31,27 @@ def add_to_database(company: str, quantity: int, price: float) -> str:
     if not tickers:
         return f"Error: Ticker for {company} not found."
     
-    exchange, quoteType, longName, shortName = get_additional_info(tickers[company])
-    sectorKey, industryKey = get_summary_profile(tickers[company])
-    financial_data = get_financial_data(tickers[company])
+    record = get_quote_records([tickers[company]]).get(tickers[company])
+
+    if not record:
+        return f"Error: No quote data found for {tickers[company]}."
 
     holding = {
-        "name": longName if longName else shortName,
+        "name": record["name"],
         "price": price,
         "quantity": quantity,
-        "sector": sectorKey,
-        "industry": industryKey,
+        "sector": record["sector"],
+        "industry": record["industry"],
         "ticker": tickers[company],
-        "quoteType": quoteType,
+        "quoteType": record["quote_type"],
         "transaction_id": str(uuid.uuid4()),
         "transaction_time": datetime.now().isoformat(),
-        "currency": financial_data.get("financialCurrency", "NA"),
-        "exchange": exchange
+        "currency": record["currency"],
+        "exchange": record["exchange"]
     }
 
     console = Console()
-    manager = HoldingsManager()
+    manager = get_holdings_manager(portfolio_id)
 
     summary_table = Table(header_style="bold magenta", border_style="dim")
     summary_table.add_column("Name", style="white", no_wrap=True)
@@ -0,0 +1,168 @@
+from functions.holding_functions import get_holdings_manager
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
+from langgraph.prebuilt import InjectedState
+from typing_extensions import Annotated
+from rich.console import Console
+from rich.table import Table
+from rich.panel import Panel
+from rich.prompt import Confirm
+from tools.ticker import get_ticker
+from tools.financials import get_quote_records
+import csv
+import json
+import os
+import uuid
+from datetime import datetime
+
+COLUMN_ALIASES = {
+    "ticker": ["ticker", "symbol", "trading symbol", "tradingsymbol", "scrip", "instrument symbol"],
+    "name": ["name", "company", "company name", "instrument", "security", "security name", "stock name"],
+    "quantity": ["quantity", "qty", "shares", "units", "quantity available"],
+    "price": ["price", "avg price", "average price", "avg. price", "avg cost", "avg. cost", "buy price", "cost price"],
+    "transaction_time": ["transaction_time", "date", "trade date", "buy date", "order execution time"]
+}
+
+
+def _normalize_row(raw_row: dict) -> dict:
+    """Maps a broker export row onto ticker/name/quantity/price/transaction_time."""
+    lowered = {str(k).strip().lower(): v for k, v in raw_row.items() if k is not None}
+    row = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            value = lowered.get(alias)
+            if value not in (None, ""):
+                row[field] = value.strip() if isinstance(value, str) else value
+                break
+    return row
+
+
+def _parse_number(value):
+    if isinstance(value, (int, float)):
+        return value
+    return float(str(value).replace(",", ""))
+
+
+def read_broker_export(file_path: str):
+    """Streams rows out of a broker CSV export or a JSON list of lots."""
+    if file_path.lower().endswith(".json"):
+        with open(file_path, "r", encoding="utf-8") as f:
+            for raw_row in json.load(f):
+                yield _normalize_row(raw_row)
+    else:
+        with open(file_path, "r", newline="", encoding="utf-8-sig") as f:
+            for raw_row in csv.DictReader(f):
+                yield _normalize_row(raw_row)
+
+
+def resolve_names(names: list[str]) -> dict:
+    """Resolves company names without a symbol to the top search result, without prompting."""
+    resolved = {}
+    for name in names:
+        quotes = get_ticker(name)
+        if quotes:
+            resolved[name] = quotes[0]["symbol"]
+    return resolved
+
+
+def bulk_import_to_database(file_path: str, portfolio_id: Annotated[str, InjectedState("portfolio_id")] = DEFAULT_PORTFOLIO_ID) -> str:
+    """
+    Import many holdings at once from a broker export (CSV or JSON) into the users account
+
+    Args:
+        file_path: Path of the broker export file extracted from the user prompt
+    """
+    console = Console()
+    manager = get_holdings_manager(portfolio_id)
+
+    if not file_path or not os.path.exists(file_path):
+        console.print(f"[bold red]Error: Broker export '{file_path}' not found.[/bold red]")
+        return f"Error: Broker export '{file_path}' not found."
+
+    console.print("Reading broker export...", style="dim italic")
+
+    lots = []
+    unresolved = []
+
+    for line_number, row in enumerate(read_broker_export(file_path), 1):
+        label = row.get("ticker") or row.get("name") or f"row {line_number}"
+        if not row.get("ticker") and not row.get("name"):
+            unresolved.append((line_number, label, "no ticker or name column"))
+            continue
+        try:
+            row["quantity"] = _parse_number(row["quantity"])
+            row["price"] = _parse_number(row["price"])
+        except (KeyError, ValueError):
+            unresolved.append((line_number, label, "missing or invalid quantity/price"))
+            continue
+        row["line_number"] = line_number
+        lots.append(row)
+
+    console.print("Resolving tickers...", style="dim italic")
+
+    names_without_ticker = sorted({row["name"] for row in lots if not row.get("ticker")})
+    name_to_ticker = resolve_names(names_without_ticker)
+
+    for row in lots:
+        if not row.get("ticker"):
+            row["ticker"] = name_to_ticker.get(row["name"])
+
+    symbols = sorted({row["ticker"] for row in lots if row.get("ticker")})
+    details = get_quote_records(symbols)
+
+    holdings = []
+    for row in lots:
+        ticker = row.get("ticker")
+        if not ticker:
+            unresolved.append((row["line_number"], row["name"], "no ticker found for name"))
+            continue
+        if ticker not in details:
+            unresolved.append((row["line_number"], ticker, "symbol not found on Yahoo Finance"))
+            continue
+
+        info = details[ticker]
+        holdings.append({
+            "name": info["name"] or row.get("name") or ticker,
+            "price": row["price"],
+            "quantity": row["quantity"],
+            "sector": info["sector"],
+            "industry": info["industry"],
+            "ticker": ticker,
+            "quoteType": info["quote_type"],
+            "transaction_id": str(uuid.uuid4()),
+            "transaction_time": row.get("transaction_time") or datetime.now().isoformat(),
+            "currency": info["currency"],
+            "exchange": info["exchange"]
+        })
+
+    if unresolved:
+        unresolved_table = Table(title="[bold]Rows that could not be imported[/bold]", header_style="bold magenta", border_style="dim")
+        unresolved_table.add_column("Row", justify="right", style="cyan")
+        unresolved_table.add_column("Entry", style="white")
+        unresolved_table.add_column("Reason", style="red")
+        for line_number, label, reason in sorted(unresolved):
+            unresolved_table.add_row(str(line_number), str(label), reason)
+        console.print(unresolved_table)
+
+    if not holdings:
+        console.print("[bold red]No holdings could be resolved from the broker export.[/bold red]")
+        return f"No holdings could be resolved from the broker export. {len(unresolved)} rows were skipped."
+
+    console.print(
+        Panel(
+            f"[bold green]{len(holdings)}[/bold green] lots across [bold]{len({h['ticker'] for h in holdings})}[/bold] instruments are ready to import.\n"
+            f"[bold red]{len(unresolved)}[/bold red] rows could not be resolved.",
+            title="[bold]Confirm Bulk Import[/bold]",
+            border_style="green",
+            padding=(1, 2)
+        )
+    )
+
+    if not Confirm.ask("Do you want to add these holdings to your portfolio?", default=True):
+        console.print("[yellow]Operation cancelled by user. No holdings were imported.[/yellow]")
+        return "Operation cancelled by user. No holdings were imported."
+
+    console.print("\nAdding holdings...", style="dim italic")
+    display = manager.add_holdings(holdings)
+    console.print(f"[green]✔ {display}[/green]")
+
+    return f"{display}. {len(unresolved)} rows could not be resolved."
@@ -1,15 +1,18 @@
-from functions.holding_functions import HoldingsManager
+from functions.holding_functions import get_holdings_manager
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
+from langgraph.prebuilt import InjectedState
+from typing_extensions import Annotated
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Confirm
 from rich.text import Text
 
-def clear_database() -> str:
+def clear_database(portfolio_id: Annotated[str, InjectedState("portfolio_id")] = DEFAULT_PORTFOLIO_ID) -> str:
     """
     Clear all holdings from the users account
     """
     console = Console()
-    manager = HoldingsManager()
+    manager = get_holdings_manager(portfolio_id)
 
     warning_text = Text(justify="center")
     warning_text.append("You are about to ", style="yellow")
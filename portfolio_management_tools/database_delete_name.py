@@ -1,11 +1,15 @@
-from functions.holding_functions import HoldingsManager
+from functions.holding_functions import get_holdings_manager
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
+from langgraph.prebuilt import InjectedState
+from typing_extensions import Annotated
+from functions.holdings_resolver import match_holdings
 from tools.ticker import get_ticker
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Confirm, IntPrompt
 
-def delete_database_by_name(companies: list[str]) -> str:
+def delete_database_by_name(companies: list[str], portfolio_id: Annotated[str, InjectedState("portfolio_id")] = DEFAULT_PORTFOLIO_ID) -> str:
     """
     Delete a holding by name from the users account
 
@@ -13,7 +17,7 @@ def delete_database_by_name(companies: list[str]) -> str:
         companies: List of companies to delete, extracted from the user prompt.
     """
     console = Console()
-    manager = HoldingsManager()
+    manager = get_holdings_manager(portfolio_id)
     
     if not companies:
         console.print("[bold red]Error: No company names were provided for deletion.[/bold red]")
@@ -22,7 +26,8 @@ def delete_database_by_name(companies: list[str]) -> str:
     tickers_to_delete = {}
 
     for company in companies:
-        stock_list = get_ticker(company)
+        # Positions already in the portfolio are matched locally; only unknown names are searched.
+        stock_list = match_holdings(manager, company) or get_ticker(company)
 
         if not stock_list:
             console.print(f"[bold red]Error: Ticker for company '{company}' not found![/bold red]")
@@ -78,10 +83,8 @@ def delete_database_by_name(companies: list[str]) -> str:
         console.print("[yellow]No holdings were selected for deletion.[/yellow]")
         return {"error": False}
 
-    final_display_messages = []
-    for company, ticker in tickers_to_delete.items():
-        result_message = manager.delete_holding_by_ticker(ticker=ticker)
+    final_display_messages = manager.delete_holdings_by_tickers(list(dict.fromkeys(tickers_to_delete.values())))
+    for result_message in final_display_messages:
         console.print(f"[green]{result_message}[/green]")
-        final_display_messages.append(result_message)
 
     return {"error": False}
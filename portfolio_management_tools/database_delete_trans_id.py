@@ -1,63 +1,73 @@
-from functions.holding_functions import HoldingsManager
+from functions.holding_functions import get_holdings_manager
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
+from langgraph.prebuilt import InjectedState
+from typing_extensions import Annotated
 from rich.console import Console
+from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Confirm
-from rich.text import Text
 
-def delete_database_by_trans(transaction_id: str) -> str:
+def delete_database_by_trans(transaction_ids: list[str], portfolio_id: Annotated[str, InjectedState("portfolio_id")] = DEFAULT_PORTFOLIO_ID) -> str:
     """
-    Delete a holding using transaction ID from the users account
+    Delete one or more holdings using transaction IDs from the users account
 
     Args:
-        transaction: Transaction ID of the holding to delete extracted from the user prompt
+        transaction_ids: List of transaction IDs of the holdings to delete extracted from the user prompt
     """
     console = Console()
-    manager = HoldingsManager()
+    manager = get_holdings_manager(portfolio_id)
 
-    if not transaction_id:
+    if not transaction_ids:
         console.print(f"[bold red]Error: Transaction ID was not provided.[/bold red]")
         return "Error: Transaction ID was not provided."
 
-    holdings = manager.list_holdings()
-    holding_to_delete = None
-
-    for holding in holdings:
-        if holding.get("transaction_id") == transaction_id:
-            holding_to_delete = holding
-            break
-            
-    if holding_to_delete:
-        details = Text(justify="left")
-        details.append("You are about to delete the following holding:\n\n", style="yellow")
-        details.append(f"  Name: ", style="bold")
-        details.append(f"{holding_to_delete.get('name', 'N/A')}\n")
-        details.append(f"  Ticker: ", style="bold")
-        details.append(f"{holding_to_delete.get('ticker', 'N/A')}\n")
-        details.append(f"  Quantity: ", style="bold")
-        details.append(f"{holding_to_delete.get('quantity', 'N/A')}\n")
-        details.append(f"  Price: ", style="bold")
-        details.append(f"{holding_to_delete.get('price', 'N/A')}\n")
-        details.append(f"  Transaction ID: ", style="bold")
-        details.append(f"{holding_to_delete.get('transaction_id', 'N/A')}")
-
-        confirmation_panel = Panel(
-            details,
-            title="[bold red]Confirm Deletion[/bold red]",
-            border_style="red",
-            padding=(1, 2)
+    # A single ID may arrive as a bare string, which would otherwise be split into characters.
+    if isinstance(transaction_ids, str):
+        transaction_ids = [transaction_ids]
+
+    transaction_ids = list(dict.fromkeys(transaction_ids))
+    holdings_by_id = {h["transaction_id"]: h for h in manager.list_holdings()}
+    holdings_to_delete = [holdings_by_id[t] for t in transaction_ids if t in holdings_by_id]
+    missing = [t for t in transaction_ids if t not in holdings_by_id]
+
+    for transaction_id in missing:
+        console.print(f"[bold red]Error: Holding with Transaction ID '{transaction_id}' not found![/bold red]")
+
+    if not holdings_to_delete:
+        return f"Holding with Transaction ID '{', '.join(missing)}' not found!"
+
+    table = Table(show_header=True, header_style="bold magenta", expand=True)
+    table.add_column("Name", style="white")
+    table.add_column("Ticker", style="green")
+    table.add_column("Quantity", justify="right")
+    table.add_column("Price", justify="right")
+    table.add_column("Transaction ID", style="cyan")
+
+    for holding in holdings_to_delete:
+        table.add_row(
+            str(holding.get("name", "N/A")),
+            str(holding.get("ticker", "N/A")),
+            str(holding.get("quantity", "N/A")),
+            str(holding.get("price", "N/A")),
+            str(holding.get("transaction_id", "N/A"))
         )
-        console.print(confirmation_panel)
 
-        if Confirm.ask("Are you sure you want to proceed?", default=False):
-            display = manager.delete_holding_by_transaction_id(transaction_id=transaction_id)
-            console.print(f"[green]✔ {display}[/green]")
-            return display
-        else:
-            display = "Deletion cancelled by user."
-            console.print(f"[yellow]⚠ {display}[/yellow]")
-            return "Deletion cancelled by user."
+    confirmation_panel = Panel(
+        table,
+        title="[bold red]Confirm Deletion[/bold red]",
+        border_style="red",
+        padding=(1, 2)
+    )
+    console.print(confirmation_panel)
 
+    if Confirm.ask("Are you sure you want to proceed?", default=False):
+        results = manager.delete_holdings_by_transaction_ids([h["transaction_id"] for h in holdings_to_delete])
+        for display in results:
+            console.print(f"[green]✔ {display}[/green]")
+        if missing:
+            results.append(f"Holding with Transaction ID '{', '.join(missing)}' not found!")
+        return "\n".join(results)
     else:
-        display = f"Holding with Transaction ID '{transaction_id}' not found!"
-        console.print(f"[bold red]Error: {display}[/bold red]")
-        return f"Holding with Transaction ID '{transaction_id}' not found!"
+        display = "Deletion cancelled by user."
+        console.print(f"[yellow]⚠ {display}[/yellow]")
+        return "Deletion cancelled by user."
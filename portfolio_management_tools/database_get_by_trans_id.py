@@ -1,16 +1,19 @@
-from functions.holding_functions import HoldingsManager
+from functions.holding_functions import get_holdings_manager
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
+from langgraph.prebuilt import InjectedState
+from typing_extensions import Annotated
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-def get_by_trans(transaction_id: str) -> str:
+def get_by_trans(transaction_id: str, portfolio_id: Annotated[str, InjectedState("portfolio_id")] = DEFAULT_PORTFOLIO_ID) -> str:
     """
     To find/fetch  holdings by their transaction ID
 
     Args:
         transaction: Transaction ID of the holding to fetch extracted from the user prompt.
     """
-    manager = HoldingsManager()
+    manager = get_holdings_manager(portfolio_id)
     console = Console()
 
     if not transaction_id:
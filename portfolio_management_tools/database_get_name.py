@@ -1,11 +1,15 @@
-from functions.holding_functions import HoldingsManager
+from functions.holding_functions import get_holdings_manager
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
+from langgraph.prebuilt import InjectedState
+from typing_extensions import Annotated
+from functions.holdings_resolver import match_holdings
 from tools.ticker import get_ticker
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Confirm, IntPrompt
 
-def get_database_by_name(companies: list[str]) -> str:
+def get_database_by_name(companies: list[str], portfolio_id: Annotated[str, InjectedState("portfolio_id")] = DEFAULT_PORTFOLIO_ID) -> str:
     """
     To find/fetch hooldings by the name of company
 
@@ -13,7 +17,7 @@ def get_database_by_name(companies: list[str]) -> str:
         companies: List of company names whose holdings we want to fetch extracted from the user prompt.
     """
     console = Console()
-    manager = HoldingsManager()
+    manager = get_holdings_manager(portfolio_id)
     
     if not companies:
         console.print("[bold red]Error: No company names were provided.[/bold red]")
@@ -22,7 +26,8 @@ def get_database_by_name(companies: list[str]) -> str:
     tickers_to_get = {}
 
     for company in companies:
-        stock_list = get_ticker(company)
+        # Positions already in the portfolio are matched locally; only unknown names are searched.
+        stock_list = match_holdings(manager, company) or get_ticker(company)
 
         if not stock_list:
             console.print(f"[bold red]Error: Ticker for company '{company}' not found![/bold red]")
@@ -1,72 +1,79 @@
-from functions.holding_functions import HoldingsManager
+from functions.holding_functions import get_holdings_manager
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
+from langgraph.prebuilt import InjectedState
+from typing_extensions import Annotated
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Confirm
 
-def update_database(transaction_id: str, new_quantity: int = -1, new_price: float = -1) -> str:
+def update_database(updates: list[dict], portfolio_id: Annotated[str, InjectedState("portfolio_id")] = DEFAULT_PORTFOLIO_ID) -> str:
     """
-    Update a particular holding in user's account
+    Update one or more holdings in user's account
 
     Args:
-        transaction_id: The transaction ID of the holding to update
-        new_quantity: The new quantity of the holding to update. Default is -1 (means unchanged).
-        new_price: The new price of the holding to update. Default is -1 (means unchanged).is -1
+        updates: List of updates extracted from the user prompt, each a dict with "transaction_id" (the transaction ID of the holding to update),
+            "new_quantity" (the new quantity, -1 or missing means unchanged) and "new_price" (the new price, -1 or missing means unchanged)
     """
-    manager = HoldingsManager()
-    holdings = manager.list_holdings()
+    manager = get_holdings_manager(portfolio_id)
     console = Console()
-    
-    holding_to_update = None
-    
-    for holding in holdings:
-        if holding["transaction_id"] == transaction_id:
-            holding_to_update = holding
-            break
 
-    if holding_to_update:
-        table = Table(show_header=True, header_style="bold magenta", expand=True)
-        table.add_column("Attribute", justify="right", style="cyan", no_wrap=True)
-        table.add_column("Current Value", justify="center", style="dim")
-        table.add_column("New Value", justify="center", style="bold green")
+    # A single update may arrive as a bare dict instead of a list of one.
+    if isinstance(updates, dict):
+        updates = [updates]
 
-        if new_quantity != -1:
-            table.add_row(
-                "Quantity",
-                str(holding_to_update["quantity"]),
-                str(new_quantity)
-            )
-        
-        if new_price != -1:
-            table.add_row(
-                "Price",
-                f"${holding_to_update['price']:.2f}",
-                f"${new_price:.2f}"
-            )
+    if not updates:
+        console.print(f"[bold red]Error: No updates were provided.[/bold red]")
+        return "Error: No updates were provided."
 
-        confirmation_panel = Panel(
-            table,
-            title=f"Confirm Update for [bold]{holding_to_update['name']} ({holding_to_update['ticker']})[/bold]",
-            border_style="yellow",
-            padding=(1, 2)
-        )
-        
-        console.print(confirmation_panel)
+    holdings_by_id = {h["transaction_id"]: h for h in manager.list_holdings()}
+    updates_to_apply = [u for u in updates if u.get("transaction_id") in holdings_by_id]
+    missing = [u.get("transaction_id") for u in updates if u.get("transaction_id") not in holdings_by_id]
 
-        if Confirm.ask("Do you want to apply these changes?", default=True):
-            display = manager.update_holding(
-                transaction_id=transaction_id, 
-                updated_quantity=new_quantity, 
-                updated_price=new_price
-            )
+    for transaction_id in missing:
+        console.print(f"[bold red]Error: Could not find a holding with transaction ID: {transaction_id}[/bold red]")
+
+    if not updates_to_apply:
+        return f"Error: Could not find a holding with transaction ID: {', '.join(map(str, missing))}"
+
+    table = Table(show_header=True, header_style="bold magenta", expand=True)
+    table.add_column("Name", style="white")
+    table.add_column("Ticker", style="green")
+    table.add_column("Transaction ID", style="cyan")
+    table.add_column("Quantity", justify="center")
+    table.add_column("Price", justify="center")
+
+    for update in updates_to_apply:
+        holding = holdings_by_id[update["transaction_id"]]
+        new_quantity = update.get("new_quantity", -1)
+        new_price = update.get("new_price", -1)
+
+        quantity = str(holding["quantity"]) if new_quantity == -1 else f"[dim]{holding['quantity']}[/dim] → [bold green]{new_quantity}[/bold green]"
+        price = f"${holding['price']:.2f}" if new_price == -1 else f"[dim]${holding['price']:.2f}[/dim] → [bold green]${new_price:.2f}[/bold green]"
+        table.add_row(str(holding.get("name", "N/A")), str(holding.get("ticker", "N/A")), update["transaction_id"], quantity, price)
+
+    confirmation_panel = Panel(
+        table,
+        title="[bold]Confirm Update[/bold]",
+        border_style="yellow",
+        padding=(1, 2)
+    )
+
+    console.print(confirmation_panel)
+
+    if Confirm.ask("Do you want to apply these changes?", default=True):
+        results = manager.update_holdings([
+            {
+                "transaction_id": update["transaction_id"],
+                "updated_quantity": update.get("new_quantity", -1),
+                "updated_price": update.get("new_price", -1)
+            }
+            for update in updates_to_apply
+        ])
+        for display in results:
             console.print(f"[green]✔ {display}[/green]")
-            return "display"
-        else:
-            console.print("[yellow]⚠ Update cancelled by user.[/yellow]")
-            return "Update operation cancelled by user."
-    
+        results += [f"Could not find a holding with transaction ID: {transaction_id}" for transaction_id in missing]
+        return "\n".join(results)
     else:
-        error_message = f"Could not find a holding with transaction ID: {transaction_id}"
-        console.print(f"[bold red]Error: {error_message}[/bold red]")
-        return f"Error: {error_message}"
-
+        console.print("[yellow]⚠ Update cancelled by user.[/yellow]")
+        return "Update operation cancelled by user."
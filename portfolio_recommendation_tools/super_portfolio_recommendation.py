@@ -1,4 +1,5 @@
 from tools.portfolio_stats import get_portfolio_breakdown
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
 from tools.sector_returns import general_sector_returns
 from tools.industry_returns import general_industry_returns, get_industry_top_companies
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -151,7 +152,7 @@ def get_sector_industry_recommendation(state: Annotated[dict, InjectedState], in
     console = Console()
     console.print("Generating recommendations...", style="dim italic")
     user_profile = state.get("user_profile", {})
-    user_portfolio = get_portfolio_breakdown()
+    user_portfolio = get_portfolio_breakdown(state.get("portfolio_id") or DEFAULT_PORTFOLIO_ID)
     sector_data = general_sector_returns()
     industry_data = general_industry_returns()
 
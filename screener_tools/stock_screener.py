@@ -11,7 +11,9 @@ from langgraph.prebuilt import InjectedState
 from typing_extensions import Annotated
 from tools.any_prompt import display_result_for_unknown_prompts
 from mappings import screener_fields_needing_conversion, country_to_currency
-from currency_converter import CurrencyConverter 
+from functions import fx
+from tools.quote_cache import quote_cache
+from functions.request_governor import yahoo_request
 
 def display_predefined_screener_results(screener_name: str, list_of_quotes: list):
     """
@@ -270,6 +272,14 @@ def display_equity_screener_results(list_of_quotes: list):
     console.print(main_panel)
 
 
+def remember_screened_quotes(list_of_quotes: list):
+    """Screener quotes carry live prices; keeps them in the shared quote cache."""
+    quote_cache.remember({
+        quote["symbol"]: quote for quote in list_of_quotes
+        if "symbol" in quote and "regularMarketPrice" in quote
+    })
+
+
 
 
 
@@ -295,13 +305,13 @@ def screen_stocks(state: Annotated[dict, InjectedState],
 
     console = Console()
     s = Screener()
-    c = CurrencyConverter()
 
     try:
         if predefined_screeners:
-            response = s.get_screeners(predefined_screeners, count)
+            response = yahoo_request("screener", s.get_screeners, predefined_screeners, count)
 
             for screener, screener_dict in response.items():
+                remember_screened_quotes(response[screener].get("quotes", []))
                 display_predefined_screener_results(screener, response[screener].get("quotes", []))
         else:
             if screener_type == "equity":
@@ -319,10 +329,9 @@ def screen_stocks(state: Annotated[dict, InjectedState],
 
                     if field in screener_fields_needing_conversion:
                         if isinstance(values, list):
-                            for i in range(len(values)):
-                                values[i] = c.convert(values[i], "USD", country_currency)
+                            values = fx.convert(values, "USD", country_currency).tolist()
                         else:
-                            values = c.convert(values, "USD", country_currency)
+                            values = fx.convert_value(values, "USD", country_currency)
 
                     if isinstance(values, list):
                         operand_values = values
@@ -333,8 +342,9 @@ def screen_stocks(state: Annotated[dict, InjectedState],
                 
                 q = EquityQuery(operator=comparison_type, operand = equity_query_list)
                 
-                response = yf.screen(q, sortField = sort_field, sortAsc = sort_ascending, size=count)
+                response = yahoo_request("screener", yf.screen, q, sortField = sort_field, sortAsc = sort_ascending, size=count)
 
+                remember_screened_quotes(response.get("quotes", []))
                 display_equity_screener_results(response.get("quotes", []))
 
             elif screener_type == "fund":
@@ -352,10 +362,9 @@ def screen_stocks(state: Annotated[dict, InjectedState],
 
                     if field in screener_fields_needing_conversion:
                         if isinstance(values, list):
-                            for i in range(len(values)):
-                                values[i] = c.convert(values[i], "USD", country_currency)
+                            values = fx.convert(values, "USD", country_currency).tolist()
                         else:
-                            values = c.convert(values, "USD", country_currency)
+                            values = fx.convert_value(values, "USD", country_currency)
 
                     if isinstance(values, list):
                         operand_values = values
@@ -366,7 +375,8 @@ def screen_stocks(state: Annotated[dict, InjectedState],
                             
                 q = FundQuery(operator=operator, operand = fund_query_list)
 
-                response = yf.screen(q, sortField = sort_field, sortAsc = sort_ascending, size=count)
+                response = yahoo_request("screener", yf.screen, q, sortField = sort_field, sortAsc = sort_ascending, size=count)
+                remember_screened_quotes(response.get("quotes", []))
                 display_fund_screener_results(response.get("quotes", []))
 
     except Exception as e:
@@ -5,7 +5,7 @@ import json
 from tools.financials import get_financial_news
 import numpy as np
 import pandas as pd
-from currency_converter import CurrencyConverter 
+from functions import fx
 from millify import millify
 from rich.console import Console
 
@@ -34,7 +34,7 @@ def _calculate_change(current, previous):
     return (current - previous) / abs(previous)
 
 def get_metric_datapackage(
-    metric_name, display_name, unit_type, company_currency, c,
+    metric_name, display_name, unit_type, company_currency,
     q_df, a_df, ttm_is_df, ttm_cf_df, ttm_vm_df, sector_key
 ):
     """
@@ -68,7 +68,7 @@ def get_metric_datapackage(
 
     if not pd.isna(ttm_value):
         if unit_type == 'currency':
-            converted_val = c.convert(ttm_value, company_currency, 'USD')
+            converted_val = fx.convert_value(ttm_value, company_currency, 'USD')
             package['ttmValue'] = millify(round(converted_val, 2)) if not pd.isna(converted_val) else "N/A"
         else:
             package['ttmValue'] = round(ttm_value, 2)
@@ -79,11 +79,10 @@ def get_metric_datapackage(
         q_df = q_df.sort_values('asOfDate').reset_index(drop=True)
         
         last_5_quarters = q_df.tail(5)
-        for _, row in last_5_quarters.iterrows():
-            date_str = row['asOfDate'].strftime('%Y-%m-%d')
-            value = row[metric_name]
+        converted_values = fx.convert(last_5_quarters[metric_name], company_currency, 'USD')
+        for as_of_date, value in zip(last_5_quarters['asOfDate'], converted_values):
             if not pd.isna(value):
-                package['quarterly']['history'][date_str] = millify(c.convert(value, company_currency, 'USD'), precision=2)
+                package['quarterly']['history'][as_of_date.strftime('%Y-%m-%d')] = millify(value, precision=2)
 
         if len(q_df) > 1:
             q0_row = q_df.iloc[-1]
@@ -109,11 +108,10 @@ def get_metric_datapackage(
         a_df = a_df.sort_values('asOfDate').reset_index(drop=True)
 
         last_5_years = a_df.tail(5)
-        for _, row in last_5_years.iterrows():
-            date_str = row['asOfDate'].strftime('%Y-%m-%d')
-            value = row[metric_name]
+        converted_values = fx.convert(last_5_years[metric_name], company_currency, 'USD')
+        for as_of_date, value in zip(last_5_years['asOfDate'], converted_values):
             if not pd.isna(value):
-                package['annual']['history'][date_str] = millify(c.convert(value, company_currency, 'USD'), precision=2)
+                package['annual']['history'][as_of_date.strftime('%Y-%m-%d')] = millify(value, precision=2)
 
         if len(a_df) >= 4:
             end_val = _safe_get(a_df, -1, metric_name)
@@ -131,7 +129,6 @@ def get_metric_datapackage(
 
 def analyze_EQUITY(equity_data):
     console = Console()
-    c = CurrencyConverter()
 
     console.print("Analyzing financial instruments...", style="dim italic")
 
@@ -316,7 +313,7 @@ def analyze_EQUITY(equity_data):
             elif metric_name in a_cf_df.columns: a_df = a_cf_df
 
             company_results[metric_name] = get_metric_datapackage(
-                metric_name, details['displayName'], details['unit_type'], company_currency, c,
+                metric_name, details['displayName'], details['unit_type'], company_currency,
                 q_df, a_df, ttm_is_df, ttm_cf_df, ttm_vm_df, sector_key
             )
 
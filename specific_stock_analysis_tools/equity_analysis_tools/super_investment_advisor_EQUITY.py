@@ -7,7 +7,7 @@ from rich.console import Console, Group
 from rich.text import Text
 from rich.table import Table
 from numpy import nan
-from tools.instrument_data import get_specific_instrument_returns, get_specific_instrument_sentiment
+from tools.instrument_data import get_instrument_indicators
 from specific_stock_analysis_tools.equity_analysis_tools.yahooquery_EQUITY import gather_yfinance_equity_data
 from specific_stock_analysis_tools.equity_analysis_tools.super_analysis_EQUITY import analyze_EQUITY
 
@@ -168,17 +168,19 @@ def investment_advice_equity(tickers: dict[str, str], state):
     company_data_package = {}
     companies = [item["company"] for item in analysis]
 
+    summary_details = {company: additional_info[company].get("summary_detail", {}) for company in companies}
+    indicators = get_instrument_indicators(companies, summary_details)
+
     for item in analysis:
         company = item["company"]
-        summary_detail = additional_info[company].get("summary_detail", {})
 
-        returns = get_specific_instrument_returns(company)
+        returns = indicators[company]["returns"]
         anayst_outlook = {
             "consensus_rating": financial_data[company].get("recommendationKey", ""),
             "average_price_target": f"{financial_data[company].get("targetMeanPrice", nan)} {financial_data[company].get("financialCurrency", "USD")}",
             "analyst_count": financial_data[company].get("numberOfAnalystOpinions", nan)
         }
-        sentiment = get_specific_instrument_sentiment(summary_detail, company)
+        sentiment = indicators[company]["sentiment"]
 
         user_profile = state.get("user_profile", {})
 
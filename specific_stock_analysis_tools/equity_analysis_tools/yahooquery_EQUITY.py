@@ -1,5 +1,15 @@
 from rich.console import Console
-from tools.financials import get_balance_sheet, get_cashflow_statement, get_financial_data, get_income_statement, get_additional_info, get_valuation_measures, get_summary_profile, get_summary_detail
+from concurrent.futures import ThreadPoolExecutor
+from tools.financials import get_balance_sheet, get_cashflow_statement, get_income_statement, get_valuation_measures, get_quote_records
+from functions.request_governor import YAHOO_MAX_CONCURRENT_REQUESTS
+from tools.quote_cache import quote_cache
+
+STATEMENT_FETCHERS = {
+    "valuation_measures": lambda ticker: get_valuation_measures(ticker),
+    "income_statement": lambda ticker: get_income_statement(ticker, 'q', True),
+    "cashflow_statement": lambda ticker: get_cashflow_statement(ticker, 'q', True),
+    "balance_sheet": lambda ticker: get_balance_sheet(ticker, 'q')
+}
 
 def stringify_keys(obj):
     if isinstance(obj, dict):
@@ -10,8 +20,13 @@ def stringify_keys(obj):
         return obj
 
 
-def gather_yfinance_equity_data(tickers):
-
+def gather_yfinance_equity_data(tickers, max_workers=YAHOO_MAX_CONCURRENT_REQUESTS):
+    """
+    Fetches statements and quote data for every ticker concurrently on max_workers
+    threads (max_workers=1 fetches one request at a time). Quote data for all tickers
+    comes from one batched request. A ticker whose fetches fail is left out of the
+    result without affecting the others.
+    """
     console = Console()
     console.print("Gathering data from yahooquery...", style="dim italic")
 
@@ -22,40 +37,61 @@ def gather_yfinance_equity_data(tickers):
     financial_data = {}
     additional_info = {}
 
+    symbols = list(dict.fromkeys(tickers.values()))
+    statements = {ticker: {} for ticker in symbols}
+    errors = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # get_quote_records and the statement getters go through the request governor for
+        # each request they actually send; statements served from the fundamentals store don't.
+        quote_future = pool.submit(get_quote_records, symbols)
+        statement_futures = {
+            (ticker, statement): pool.submit(fetch, ticker)
+            for ticker in symbols
+            for statement, fetch in STATEMENT_FETCHERS.items()
+        }
 
-    for company in tickers:
         try:
-            ticker = tickers[company]
-
-            valuation_measures[ticker] = get_valuation_measures(ticker)
-
-            income_statement[ticker] = get_income_statement(ticker, 'q', True)
+            quote_records = quote_future.result()
+        except Exception as e:
+            print(f"Error fetching quote data: {e}")
+            quote_records = {}
 
-            cash_flow[ticker] = get_cashflow_statement(ticker, 'q', True)
+        # The price module came with the quote data; later price lookups this turn reuse it.
+        quote_cache.remember({ticker: record["price"] for ticker, record in quote_records.items()})
 
-            balance_sheet[ticker] = get_balance_sheet(ticker, 'q')
+        for (ticker, statement), future in statement_futures.items():
+            try:
+                statements[ticker][statement] = future.result()
+            except Exception as e:
+                errors.setdefault(ticker, e)
 
-            exchange, quoteType, longName, shortName = get_additional_info(ticker)
+    for ticker in symbols:
+        if ticker in errors:
+            print(f"Error fetching data for {ticker}: {errors[ticker]}")
+            continue
 
-            sectorKey, industryKey = get_summary_profile(ticker)
+        record = quote_records.get(ticker)
+        if record is None:
+            print(f"Error fetching data for {ticker}: no quote data")
+            continue
 
-            additional_info_dict = {
-                "longName": longName,
-                "shortName": shortName,
-                "sectorKey": sectorKey,
-                "industryKey": industryKey,
-                "exchange": exchange,
-                "quoteType": quoteType,
-                "summary_detail": get_summary_detail(ticker)
-            }
-            
-            additional_info[ticker] = dict(additional_info_dict)
+        valuation_measures[ticker] = statements[ticker]["valuation_measures"]
+        income_statement[ticker] = statements[ticker]["income_statement"]
+        cash_flow[ticker] = statements[ticker]["cashflow_statement"]
+        balance_sheet[ticker] = statements[ticker]["balance_sheet"]
+
+        additional_info[ticker] = {
+            "longName": record["long_name"],
+            "shortName": record["short_name"],
+            "sectorKey": record["sector"],
+            "industryKey": record["industry"],
+            "exchange": record["exchange"],
+            "quoteType": record["quote_type"],
+            "summary_detail": record["summary_detail"]
+        }
 
-            financial_data[ticker] = get_financial_data(ticker)
-            
-        except Exception as e:
-            print(f"Error fetching data for {ticker}: {e}")
-            continue
+        financial_data[ticker] = record["financial_data"]
 
     equity_data = {
             "valuation_measures": valuation_measures,
@@ -67,5 +103,3 @@ def gather_yfinance_equity_data(tickers):
         }
 
     return equity_data
-
-    
\ No newline at end of file
@@ -1,5 +1,5 @@
 from rich.console import Console
-from tools.financials import get_additional_info, get_summary_detail, get_fund_performance, get_fund_sector_weightings, get_fund_valuation_measures
+from tools.financials import get_fund_records
 
 def stringify_keys(obj):
     if isinstance(obj, dict):
@@ -11,47 +11,40 @@ def stringify_keys(obj):
 
 
 def gather_yahooquery_mf_data(tickers):
-
+    """
+    Collects performance, sector weightings, equity holdings and quote details for every
+    fund, requesting all fund modules for all funds in one batched get_modules call.
+    """
     console = Console()
     console.print("Gathering data from yahooquery...", style="dim italic")
 
-    additional_info = {}
-    fund_sector_weightings = {}
-    fund_performance = {}
     fund_data = {}
 
+    symbols = list(dict.fromkeys(tickers.values()))
 
-    for company in tickers:
-        try:
-            ticker = tickers[company]
-
-            fund_sector_weightings = get_fund_sector_weightings(ticker)
-            fund_performance = get_fund_performance(ticker)
-            fund_valuation_measures = get_fund_valuation_measures(ticker)
+    try:
+        fund_records = get_fund_records(symbols)
+    except Exception as e:
+        print(f"Error fetching fund data: {e}")
+        return fund_data
 
-            exchange, quoteType, longName, shortName = get_additional_info(ticker)
+    for ticker in symbols:
+        record = fund_records.get(ticker)
+        if record is None:
+            print(f"Error fetching data for {ticker}: no fund data")
+            continue
 
-            additional_info_dict = {
-                "longName": longName,
-                "shortName": shortName,
-                "exchange": exchange,
-                "quoteType": quoteType,
-                "summary_detail": get_summary_detail(ticker)
+        fund_data[ticker] = {
+            "fund_performance": record["fund_performance"],
+            "fund_sector_weightings": record["fund_sector_weightings"],
+            "fund_valuation_measures": record["fund_equity_holdings"],
+            "additional_info": {
+                "longName": record["long_name"],
+                "shortName": record["short_name"],
+                "exchange": record["exchange"],
+                "quoteType": record["quote_type"],
+                "summary_detail": record["summary_detail"]
             }
-            
-            additional_info = dict(additional_info_dict)
-
-            fund_data[ticker] = {
-                "fund_performance": fund_performance,
-                "fund_sector_weightings": fund_sector_weightings,
-                "fund_valuation_measures": fund_valuation_measures,
-                "additional_info": additional_info
-            }
-            
-        except Exception as e:
-            print(f"Error fetching data for {ticker}: {e}")
-            continue
+        }
 
     return fund_data
-
-    
\ No newline at end of file
@@ -1,5 +1,5 @@
 from tools.ticker import get_tickers
-from yahooquery.ticker import Ticker
+from tools.financials import get_quote_records
 from rich.console import Console
 from typing_extensions import Annotated
 from langgraph.prebuilt import InjectedState
@@ -21,12 +21,11 @@ def specific_stock_analysis(companies: list[str], state: Annotated[dict, Injecte
 
     tickers = get_tickers(companies)
 
-    for company, ticker in tickers.items():
+    quote_records = get_quote_records(list(tickers.values()))
 
-        stock = Ticker(ticker)
-        company_dict = stock.quote_type[ticker]
+    for company, ticker in tickers.items():
 
-        quote_type = company_dict.get("quoteType", None)
+        quote_type = quote_records.get(ticker, {}).get("quote_type", None)
 
         if quote_type == "EQUITY":
             equity_dict[company] = ticker
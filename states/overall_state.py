@@ -5,6 +5,7 @@ class OverallState(MessagesState):
     user_intent: dict
     tickers: dict
     user_profile: dict
+    portfolio_id: str
     user_sub_intent: dict
     suggestions: dict
     pending_tool_calls: list
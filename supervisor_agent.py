@@ -11,6 +11,10 @@ from rich.prompt import Prompt, IntPrompt
 from rich.table import Table
 import traceback
 import json
+import os
+
+from functions.portfolios import DEFAULT_PORTFOLIO_ID, portfolio_file, validate_portfolio_id
+from functions.cassette import install_from_env
 
 overallGraph = StateGraph(OverallState)
 overallGraph.add_node("parse_user_input", parse_user_input)
@@ -25,10 +29,22 @@ graph = overallGraph.compile()
 console = Console()
 
 if __name__ == "__main__":
+    cassette = install_from_env()
+    if cassette:
+        console.print(f"[dim]Network calls are being {cassette.mode}ed using {cassette.path}[/dim]")
+
     console.print("[bold green]Welcome to the Financial Advisor Bot![/bold green]")
     console.print("Type 'quit' or 'exit' to end the session.\n")
 
-    file_path = "C:\\Users\\yuvra\\OneDrive\\Desktop\\Portfolio Manager Agent\\Database\\settings.json"
+    portfolio_id = validate_portfolio_id(os.environ.get("PORTFOLIO_ID", DEFAULT_PORTFOLIO_ID))
+    if portfolio_id != DEFAULT_PORTFOLIO_ID:
+        console.print(f"Using portfolio [bold cyan]{portfolio_id}[/bold cyan]\n")
+
+    file_path = portfolio_file(portfolio_id, "settings.json")
+
+    if not os.path.exists(file_path):
+        with open(file_path, "w") as f:
+            json.dump({"user_profile_created": False}, f, indent=4)
 
     settings = {}
     with open(file_path, "r") as  f:
@@ -81,7 +97,7 @@ if __name__ == "__main__":
                 break
             
             result = graph.invoke(
-                {"messages": [{"role": "user", "content": prompt}], "user_profile": user_profile},
+                {"messages": [{"role": "user", "content": prompt}], "user_profile": user_profile, "portfolio_id": portfolio_id},
                 config={"configurable": {"thread_id": 1}}
             )
 
@@ -1,13 +1,148 @@
 import pandas as pd
+from typing import Dict, Optional, TypedDict
 from yahooquery import Ticker
 from langchain_google_genai import ChatGoogleGenerativeAI
 from google.ai.generativelanguage_v1beta.types import Tool as GenAITool
+from functions.fundamentals_store import FundamentalsStore
+from functions.request_governor import yahoo_request, yahoo_batch_request
+
+QUOTE_MODULES = ["quoteType", "summaryProfile", "summaryDetail", "financialData", "price"]
+FUND_MODULES = ["quoteType", "summaryDetail", "fundPerformance", "topHoldings"]
+QUOTE_BATCH_SIZE = 50
+
+_fundamentals = FundamentalsStore()
+
+
+class QuoteRecord(TypedDict):
+    symbol: str
+    name: Optional[str]
+    long_name: Optional[str]
+    short_name: Optional[str]
+    quote_type: Optional[str]
+    exchange: Optional[str]
+    sector: Optional[str]
+    industry: Optional[str]
+    currency: str
+    summary_detail: dict
+    financial_data: dict
+    price: dict
+
+
+class FundRecord(TypedDict):
+    symbol: str
+    long_name: Optional[str]
+    short_name: Optional[str]
+    quote_type: Optional[str]
+    exchange: Optional[str]
+    summary_detail: dict
+    fund_performance: dict
+    fund_sector_weightings: dict
+    fund_equity_holdings: dict
+
+
+def _module(modules: dict, name: str) -> dict:
+    module = modules.get(name)
+    return module if isinstance(module, dict) else {}
+
+
+def _get_modules(tickers, modules) -> Dict[str, dict]:
+    """
+    {symbol: {module: data}} for many symbols, with one get_modules request per
+    QUOTE_BATCH_SIZE symbols. Symbols Yahoo returns no quote type for are left out.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    modules_by_symbol = {}
+
+    for i in range(0, len(tickers), QUOTE_BATCH_SIZE):
+        batch = tickers[i:i + QUOTE_BATCH_SIZE]
+        response = yahoo_batch_request("quote", batch, lambda pending: Ticker(pending, asynchronous=True).get_modules(modules))
+        if not isinstance(response, dict):
+            continue
+
+        for symbol in batch:
+            symbol_modules = response.get(symbol)
+            # Unknown symbols come back as an error string instead of a dict of modules.
+            if isinstance(symbol_modules, dict) and _module(symbol_modules, "quoteType"):
+                modules_by_symbol[symbol] = symbol_modules
+
+    return modules_by_symbol
+
+
+def get_quote_records(tickers) -> Dict[str, QuoteRecord]:
+    """
+    Fetches quoteType, summaryProfile, summaryDetail, financialData and price for many
+    symbols, with one get_modules request per QUOTE_BATCH_SIZE symbols. Symbols Yahoo
+    has no quote type for are left out.
+    """
+    records = {}
+
+    for symbol, modules in _get_modules(tickers, QUOTE_MODULES).items():
+        quote_type = _module(modules, "quoteType")
+        profile = _module(modules, "summaryProfile")
+        financial_data = _module(modules, "financialData")
+        price = _module(modules, "price")
+
+        records[symbol] = QuoteRecord(
+            symbol=symbol,
+            name=quote_type.get("longName") or quote_type.get("shortName"),
+            long_name=quote_type.get("longName", None),
+            short_name=quote_type.get("shortName", None),
+            quote_type=quote_type.get("quoteType", None),
+            exchange=quote_type.get("exchange", None),
+            sector=profile.get("sectorKey", None),
+            industry=profile.get("industryKey", None),
+            currency=financial_data.get("financialCurrency") or price.get("currency") or "NA",
+            summary_detail=_module(modules, "summaryDetail"),
+            financial_data=financial_data,
+            price=price
+        )
+
+    return records
+
+
+def get_fund_records(tickers) -> Dict[str, FundRecord]:
+    """
+    Fetches quote type, summary detail, performance, sector weightings and equity holdings
+    for many funds, with one get_modules request per QUOTE_BATCH_SIZE funds.
+    """
+    records = {}
+
+    for symbol, modules in _get_modules(tickers, FUND_MODULES).items():
+        quote_type = _module(modules, "quoteType")
+        top_holdings = _module(modules, "topHoldings")
+
+        # sectorWeightings is a list of single-entry {sector: weight} dicts.
+        sector_weightings = {}
+        for weighting in top_holdings.get("sectorWeightings", []):
+            sector_weightings.update({sector: weight for sector, weight in weighting.items() if weight != 0})
+
+        records[symbol] = FundRecord(
+            symbol=symbol,
+            long_name=quote_type.get("longName", None),
+            short_name=quote_type.get("shortName", None),
+            quote_type=quote_type.get("quoteType", None),
+            exchange=quote_type.get("exchange", None),
+            summary_detail=_module(modules, "summaryDetail"),
+            fund_performance=_module(modules, "fundPerformance"),
+            fund_sector_weightings=sector_weightings,
+            fund_equity_holdings=_module(top_holdings, "equityHoldings")
+        )
+
+    return records
+
+
+def _statement(ticker, statement, frequency, fetch):
+    """
+    A statement from the fundamentals store; Yahoo is only asked (through the request
+    governor) when the stored copy is missing or a newer period should have been filed by now.
+    """
+    return _fundamentals.get(ticker, statement, frequency, lambda: yahoo_request("fundamentals", fetch))
+
 
 def get_valuation_measures(ticker):
-    stock = Ticker(ticker)
-    valuation_measures_df = stock.valuation_measures
+    valuation_measures_df = _statement(ticker, "valuation_measures", "q", lambda: Ticker(ticker).valuation_measures)
 
-    if(not isinstance(valuation_measures_df, str)):
+    if(valuation_measures_df is not None):
         return valuation_measures_df
     else:
         return pd.DataFrame() 
@@ -16,11 +151,10 @@ def get_valuation_measures(ticker):
 
 
 def get_income_statement(ticker, frequency, trailing):
-    stock = Ticker(ticker)
-    income_statement_df = stock.income_statement(frequency=frequency, trailing=trailing)
-    income_statement_df_annual = stock.income_statement(frequency='a', trailing=False)
+    income_statement_df = _statement(ticker, "income_statement", frequency + ("_trailing" if trailing else ""), lambda: Ticker(ticker).income_statement(frequency=frequency, trailing=trailing))
+    income_statement_df_annual = _statement(ticker, "income_statement", "a", lambda: Ticker(ticker).income_statement(frequency='a', trailing=False))
 
-    if(not isinstance(income_statement_df, str) and not isinstance(income_statement_df_annual, str)):
+    if(income_statement_df is not None and income_statement_df_annual is not None):
         final_df = pd.concat([income_statement_df, income_statement_df_annual])
     else:
         return pd.DataFrame()
@@ -29,12 +163,10 @@ def get_income_statement(ticker, frequency, trailing):
 
 
 def get_cashflow_statement(ticker, frequency, trailing):
-    stock = Ticker(ticker)
+    cashflow_statement_df = _statement(ticker, "cash_flow", frequency + ("_trailing" if trailing else ""), lambda: Ticker(ticker).cash_flow(frequency=frequency, trailing=trailing))
+    cashflow_statement_df_annual = _statement(ticker, "cash_flow", "a", lambda: Ticker(ticker).cash_flow(frequency='a', trailing=False))
 
-    cashflow_statement_df = stock.cash_flow(frequency=frequency, trailing=trailing)
-    cashflow_statement_df_annual = stock.cash_flow(frequency='a', trailing=False)
-
-    if(not isinstance(cashflow_statement_df, str) and not isinstance(cashflow_statement_df_annual, str)):
+    if(cashflow_statement_df is not None and cashflow_statement_df_annual is not None):
         final_df = pd.concat([cashflow_statement_df, cashflow_statement_df_annual])
     else:
         return pd.DataFrame()
@@ -43,12 +175,10 @@ def get_cashflow_statement(ticker, frequency, trailing):
 
 
 def get_balance_sheet(ticker, frequency):
-    stock = Ticker(ticker)
-
-    balance_sheet_df = stock.balance_sheet(frequency=frequency)
-    balance_sheet_df_annual = stock.balance_sheet(frequency='a')
+    balance_sheet_df = _statement(ticker, "balance_sheet", frequency, lambda: Ticker(ticker).balance_sheet(frequency=frequency))
+    balance_sheet_df_annual = _statement(ticker, "balance_sheet", "a", lambda: Ticker(ticker).balance_sheet(frequency='a'))
 
-    if(not isinstance(balance_sheet_df, str) and not isinstance(balance_sheet_df_annual, str)):
+    if(balance_sheet_df is not None and balance_sheet_df_annual is not None):
         final_df = pd.concat([balance_sheet_df, balance_sheet_df_annual]).drop_duplicates()
     else:
         return pd.DataFrame()
@@ -59,7 +189,7 @@ def get_balance_sheet(ticker, frequency):
 def get_additional_info(ticker):
     stock = Ticker(ticker)
 
-    company_dict = stock.quote_type[ticker]
+    company_dict = yahoo_request("quote", lambda: stock.quote_type)[ticker]
     exchange = company_dict.get("exchange", None)
     quote_type = company_dict.get("quoteType", None)
     long_name = company_dict.get("longName", None)
@@ -70,7 +200,7 @@ def get_additional_info(ticker):
 def get_summary_profile(ticker):
     stock = Ticker(ticker)
 
-    company_dict = stock.summary_profile[ticker]
+    company_dict = yahoo_request("quote", lambda: stock.summary_profile)[ticker]
 
     sector_key = company_dict.get("sectorKey", None)
     industry_key = company_dict.get("industryKey", None)
@@ -81,7 +211,7 @@ def get_summary_profile(ticker):
 def get_summary_detail(ticker):
     stock = Ticker(ticker)
 
-    company_dict = stock.summary_detail[ticker]
+    company_dict = yahoo_request("quote", lambda: stock.summary_detail)[ticker]
 
     return company_dict
 
@@ -89,7 +219,7 @@ def get_summary_detail(ticker):
 def get_financial_data(ticker):
     stock = Ticker(ticker)
 
-    financials = stock.financial_data[ticker]
+    financials = yahoo_request("quote", lambda: stock.financial_data)[ticker]
 
     return financials
 
@@ -97,7 +227,7 @@ def get_financial_data(ticker):
 def get_fund_performance(ticker):
     stock = Ticker(ticker)
 
-    fund_performance = stock.fund_performance[ticker]
+    fund_performance = yahoo_request("quote", lambda: stock.fund_performance)[ticker]
 
     return fund_performance
 
@@ -105,7 +235,7 @@ def get_fund_performance(ticker):
 def get_fund_sector_weightings(ticker):
     stock = Ticker(ticker)
 
-    fund_sector_weightings = stock.fund_sector_weightings
+    fund_sector_weightings = yahoo_request("quote", lambda: stock.fund_sector_weightings)
 
     fund_sector_weightings = fund_sector_weightings[fund_sector_weightings[ticker] != 0].to_dict()[ticker]
 
@@ -115,7 +245,7 @@ def get_fund_sector_weightings(ticker):
 def get_fund_valuation_measures(ticker):
     stock = Ticker(ticker)
 
-    fund_valuation_measures = stock.fund_equity_holdings[ticker]
+    fund_valuation_measures = yahoo_request("quote", lambda: stock.fund_equity_holdings)[ticker]
 
     return fund_valuation_measures
 
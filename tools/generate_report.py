@@ -1,13 +1,13 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from yahooquery import Ticker
+from tools.quote_cache import get_quotes
 from playwright.sync_api import sync_playwright
 from datetime import datetime
 import base64
 from io import BytesIO
 import logging
-from currency_converter import CurrencyConverter
+from functions import fx
 from rich.console import Console
 
 logging.getLogger('matplotlib.font_manager').disabled = True
@@ -209,18 +209,19 @@ SECTOR_COLORS = {
 
 
 
-def generate_portfolio_report(holdings: list, output_path: str, base_currency: str = "INR"):
+def generate_portfolio_report(positions, output_path: str, base_currency: str = "INR"):
     """
-    Analyzes a list of stock holdings and generates a detailed PDF report.
+    Analyzes aggregated positions (a list from HoldingsManager.list_positions or the
+    ticker-indexed frame from load_positions_frame) and generates a detailed PDF report.
     """
     console = Console()
     console.print("Generating portfolio report...", style="dim italic")
-    if not holdings:
-        print("Error: Holdings list is empty. Cannot generate report.")
+    if positions is None or len(positions) == 0:
+        print("Error: Positions list is empty. Cannot generate report.")
         return
 
     try:
-        df_consolidated = preprocess_holdings(holdings)
+        df_consolidated = positions_to_frame(positions)
         
         unique_tickers = df_consolidated.index.tolist()
         market_data = fetch_market_data(unique_tickers)
@@ -248,30 +249,19 @@ def generate_portfolio_report(holdings: list, output_path: str, base_currency: s
         return
 
 
-def preprocess_holdings(holdings: list) -> pd.DataFrame:
-    """Converts the list of transactions into a consolidated DataFrame."""
-    df = pd.DataFrame(holdings)
-    df['total_cost'] = df['price'] * df['quantity']
-    
-    df_agg = df.groupby('ticker').agg(
-        quantity=('quantity', 'sum'),
-        total_cost=('total_cost', 'sum'),
-        name=('name', 'first'),
-        sector=('sector', 'first'),
-        industry=('industry', 'first'),
-        currency=('currency', 'first')
-    )
-    df_agg['weighted_avg_cost'] = df_agg['total_cost'] / df_agg['quantity']
-    return df_agg
+def positions_to_frame(positions) -> pd.DataFrame:
+    """Builds the consolidated DataFrame straight from precomputed per-ticker positions."""
+    if isinstance(positions, pd.DataFrame):
+        return positions.copy()
+    return pd.DataFrame(positions).set_index('ticker')
 
 def fetch_market_data(tickers: list) -> dict:
-    """Fetches current price for a list of tickers."""
-    ticker_obj = Ticker(tickers, asynchronous=True)
-    data = ticker_obj.price
+    """Fetches current price for a list of tickers, through the shared quote cache."""
+    data = get_quotes(tickers)
     
     results = {}
-    for ticker, ticker_data in data.items():
-        current_price = ticker_data.get('regularMarketPrice', None)
+    for ticker in tickers:
+        current_price = data.get(ticker, {}).get('regularMarketPrice', None)
         if current_price:
             results[ticker] = {'current_price': current_price}
         else:
@@ -280,20 +270,17 @@ def fetch_market_data(tickers: list) -> dict:
 
 def perform_analysis(df: pd.DataFrame, market_data: dict, base_currency: str) -> tuple[pd.DataFrame, dict]:
     """Merges all data and calculates key portfolio metrics."""
-    c = CurrencyConverter()
-    df['current_price'] = df.index.map(lambda x: market_data.get(x, {}).get('current_price'))
+    current_prices = pd.Series({ticker: data.get('current_price') for ticker, data in market_data.items()}, dtype=float)
+    df['current_price'] = current_prices.reindex(df.index).to_numpy()
     
     df.dropna(subset=['current_price'], inplace=True)
     if df.empty:
         raise ValueError("Could not fetch market price for any holdings.")
 
-    def convert_to_base(row):
-        local_market_value = row['current_price'] * row['quantity']
-        cost_base = c.convert(row['total_cost'], row['currency'], base_currency)
-        market_value_base = c.convert(local_market_value, row['currency'], base_currency)
-        return pd.Series([cost_base, market_value_base])
-
-    df[['total_cost_base', 'market_value_base']] = df.apply(convert_to_base, axis=1)
+    # One rate per distinct currency, broadcast over the rows in that currency.
+    rates = fx.convert(np.ones(len(df)), df['currency'], base_currency)
+    df['total_cost_base'] = df['total_cost'].to_numpy(dtype=float) * rates
+    df['market_value_base'] = df['current_price'].to_numpy(dtype=float) * df['quantity'].to_numpy(dtype=float) * rates
     
     df['gain_loss_base'] = df['market_value_base'] - df['total_cost_base']
     df['gain_loss_pct'] = (df['gain_loss_base'] / df['total_cost_base']).replace([np.inf, -np.inf], 0) * 100
@@ -328,7 +315,7 @@ def create_sector_donut_chart(df: pd.DataFrame) -> tuple[str, str]:
     total_market_value = df['market_value_base'].sum()
     if total_market_value == 0: return "", ""
 
-    sector_pct = (df.groupby('sector')['market_value_base'].sum() / total_market_value) * 100
+    sector_pct = (df.groupby('sector', observed=True)['market_value_base'].sum() / total_market_value) * 100
     sector_pct = sector_pct.sort_values(ascending=False)
     
     if sector_pct.empty: return "", ""
@@ -384,7 +371,7 @@ def create_sector_donut_chart(df: pd.DataFrame) -> tuple[str, str]:
 
 def generate_industry_list_html(df: pd.DataFrame) -> str:
     """Generates a robust HTML block structure for industry allocation."""
-    industry_alloc = df.groupby(['sector', 'industry'])['pct_of_portfolio'].sum().reset_index()
+    industry_alloc = df.groupby(['sector', 'industry'], observed=True)['pct_of_portfolio'].sum().reset_index()
     html = "<div class='industry-allocation-container'>"
 
     for sector, _ in SUPER_SECTOR_MAP.items():
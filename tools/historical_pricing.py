@@ -1,8 +1,13 @@
 from yahooquery import Ticker
+from functions.history_store import HistoryStore, CACHED_INTERVALS
+from functions.request_governor import yahoo_request
 
 def get_historical_pricing(ticker_list, period, interval="1d"):
+    if interval in CACHED_INTERVALS:
+        return HistoryStore(interval).get(ticker_list, period)
+
     tickers = Ticker(ticker_list, asynchronous=True)
 
-    history = tickers.history(period=period, interval=interval)
+    history = yahoo_request("history", tickers.history, period=period, interval=interval)
 
-    return history
\ No newline at end of file
+    return history
@@ -1,13 +1,13 @@
-from tools.historical_pricing import get_historical_pricing
+from tools.period_returns import get_period_returns
 from mappings import sector_industry_mapping_dict
 from tools.instrument_data import get_specific_instrument_returns
 import yfinance as yf
+from functions.request_governor import yahoo_request
 
 def general_industry_returns():
     """
     Returns a dictionary of periodwise returns for all industries
     """
-    periods = ["ytd", "1mo", "3mo", "1y", "3y", "5y", "10y"]
     sectors = list(sector_industry_mapping_dict.keys())
     industry_returns = {sector: {} for sector in sectors}
 
@@ -19,30 +19,22 @@ def general_industry_returns():
             all_industry_tickers.append(ticker)
             ticker_to_info_map[ticker] = {"sector": sector, "name": industry_name}
 
-    for period in periods:
-        industry_df = get_historical_pricing(all_industry_tickers, period=period, interval="1d")
+    for symbol, returns in get_period_returns(all_industry_tickers).items():
+        info = ticker_to_info_map[symbol]
+        sector_name = info["sector"]
+        industry_name = info["name"]
 
-        for symbol, symbol_df in industry_df.groupby('symbol'):
-            if symbol_df.empty:
-                continue
+        if("performance_data" not in industry_returns[sector_name]):
+            industry_returns[sector_name]["performance_data"] = {}
 
-            ret = round(((symbol_df.iloc[-1]["close"] - symbol_df.iloc[0]["close"]) / symbol_df.iloc[0]["close"]) * 100, 2)
-            
-            info = ticker_to_info_map[symbol]
-            sector_name = info["sector"]
-            industry_name = info["name"]
+        if("industry_list" not in industry_returns[sector_name]):
+            industry_returns[sector_name]["industry_list"] = []
 
-            if("performance_data" not in industry_returns[sector_name]):
-                industry_returns[sector_name]["performance_data"] = {}
+        if industry_name not in industry_returns[sector_name]["performance_data"]:
+            industry_returns[sector_name]["performance_data"][industry_name] = {}
 
-            if("industry_list" not in industry_returns[sector_name]):
-                industry_returns[sector_name]["industry_list"] = []
-
-            if industry_name not in industry_returns[sector_name]["performance_data"]:
-                industry_returns[sector_name]["performance_data"][industry_name] = {}
-            
-            industry_returns[sector_name]["industry_list"].append(industry_name)
-            industry_returns[sector_name]["performance_data"][industry_name][period] = ret
+        industry_returns[sector_name]["industry_list"].append(industry_name)
+        industry_returns[sector_name]["performance_data"][industry_name].update(returns)
 
     return industry_returns
 
@@ -59,8 +51,6 @@ def specific_sector_industry_returns(sectors_to_process):
     Args:
         sectors_to_process (list): A list of sector names to process.
     """
-    periods = ["ytd", "1mo", "3mo", "1y", "3y", "5y", "10y"]
-    
     industry_returns = {sector: {} for sector in sectors_to_process}
 
     all_industry_tickers = []
@@ -75,26 +65,15 @@ def specific_sector_industry_returns(sectors_to_process):
         else:
             print(f"Warning: Sector '{sector}' not found and will be skipped.")
 
-    for period in periods:
-        if not all_industry_tickers:
-            continue
-            
-        industry_df = get_historical_pricing(all_industry_tickers, period=period, interval="1d")
-
-        for symbol, symbol_df in industry_df.groupby('symbol'):
-            if symbol_df.empty:
-                continue
+    for symbol, returns in get_period_returns(all_industry_tickers).items():
+        info = ticker_to_info_map[symbol]
+        sector_name = info["sector"]
+        industry_name = info["name"]
 
-            ret = round(((symbol_df.iloc[-1]["close"] - symbol_df.iloc[0]["close"]) / symbol_df.iloc[0]["close"]) * 100, 2)
-            
-            info = ticker_to_info_map[symbol]
-            sector_name = info["sector"]
-            industry_name = info["name"]
+        if industry_name not in industry_returns[sector_name]:
+            industry_returns[sector_name][industry_name] = {}
 
-            if industry_name not in industry_returns[sector_name]:
-                industry_returns[sector_name][industry_name] = {}
-            
-            industry_returns[sector_name][industry_name][period] = ret
+        industry_returns[sector_name][industry_name].update(returns)
 
 
     return industry_returns
@@ -116,9 +95,9 @@ def get_industry_top_companies(recommendations):
             industry_top_companies[sector][industry] = {}
 
             industry_obj = yf.Industry(industry)
-            top_companies = industry_obj.top_companies
-            top_performing_companies = industry_obj.top_performing_companies
-            top_growth_companies = industry_obj.top_growth_companies
+            top_companies = yahoo_request("industry", lambda: industry_obj.top_companies)
+            top_performing_companies = yahoo_request("industry", lambda: industry_obj.top_performing_companies)
+            top_growth_companies = yahoo_request("industry", lambda: industry_obj.top_growth_companies)
 
             top_companies["market weight"] = round(top_companies["market weight"] * 100, 2)
             top_companies = top_companies[:5]
@@ -1,58 +1,78 @@
 from tools.historical_pricing import get_historical_pricing
 from tools.financials import get_financial_data
+from tools.period_returns import get_period_returns, window_returns
+from tools.quote_cache import get_quotes
+from tools.technical_indicators import price_matrix, latest, rsi, moving_average, realized_volatility
 from numpy import nan
+import numpy as np
 import pandas as pd
 
+INSTRUMENT_RETURN_PERIODS = ["ytd", "1mo", "3mo", "1y", "3y", "5y"]
+
 def get_specific_instrument_returns(instrument):
-    periods = ["ytd", "1mo", "3mo", "1y", "3y", "5y"]
+    return get_period_returns([instrument], INSTRUMENT_RETURN_PERIODS).get(instrument, {})
+
+
+def get_instrument_indicators(tickers, summary_details=None):
+    """
+    Returns {ticker: {"returns": ..., "sentiment": ...}} for every ticker from one daily
+    history request covering the longest return period. Period returns, the 14-day RSI,
+    the 50/200-day averages and the realized volatility are all derived from that series;
+    beta comes from the ticker's summary_detail.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    summary_details = summary_details or {}
+    if not tickers:
+        return {}
+
+    history = get_historical_pricing(tickers, period=INSTRUMENT_RETURN_PERIODS[-1], interval="1d")
+    returns = window_returns(history["close"], INSTRUMENT_RETURN_PERIODS)
+    quotes = get_quotes(tickers)
+
+    closes = price_matrix(history).reindex(columns=tickers)
+    technicals = pd.DataFrame({
+        "last_close": latest(closes),
+        "rsi": latest(rsi(closes)).round(2),
+        "ma_50": latest(moving_average(closes, 50)),
+        "ma_200": latest(moving_average(closes, 200)),
+        "volatility": latest(realized_volatility(closes))
+    })
+
+    indicators = {}
+    for ticker, row in technicals.iterrows():
+        summary_detail = summary_details.get(ticker, {})
 
-    instrument_returns = {}
+        ticker_returns = {}
+        if ticker in returns.index:
+            ticker_returns = {period: ret for period, ret in returns.loc[ticker].items() if not np.isnan(ret)}
 
-    for period in periods:
-        instrument_df = get_historical_pricing([instrument], period, "1d")
+        current_price = quotes.get(ticker, {}).get("regularMarketPrice")
+        if not current_price:
+            current_price = row["last_close"] if not np.isnan(row["last_close"]) else summary_detail.get("previousClose", nan)
 
-        for symbol, symbol_df in instrument_df.groupby("symbol"):
-            ret = round(((symbol_df.iloc[-1]["close"] - symbol_df.iloc[0]["close"])/symbol_df.iloc[0]["close"]) * 100, 2)
-            instrument_returns[period] = ret
+        price_vs_50_day_avg = ((current_price - row["ma_50"])/row["ma_50"]) * 100
+        price_vs_200_day_avg = ((current_price - row["ma_200"])/row["ma_200"]) * 100
 
-    return instrument_returns
+        indicators[ticker] = {
+            "returns": ticker_returns,
+            "sentiment": {
+                "rsi_14_day": None if np.isnan(row["rsi"]) else row["rsi"],
+                "price_vs_50_day_avg": f"{round(price_vs_50_day_avg, 2)}%",
+                "price_vs_200_day_avg": f"{round(price_vs_200_day_avg, 2)}%",
+                "realized_volatility_1y": f"{round(row['volatility'], 2)}%",
+                "beta": summary_detail.get("beta", nan)
+            }
+        }
+
+    return indicators
 
 
 def get_specific_instrument_sentiment(summary_detail, ticker):
-    fifty_day_average = summary_detail.get("fiftyDayAverage", nan)
-    two_hundred_day_average = summary_detail.get("twoHundredDayAverage", nan)
-    beta = summary_detail.get("beta", nan)
-    current_price = summary_detail.get("previousClose", nan)
-
-    historical_pricing = get_historical_pricing([ticker], "60d", "1d")
-    rsi = get_specific_instrument_rsi(list(historical_pricing["close"]))
-
-    price_vs_50_day_avg = ((current_price - fifty_day_average)/fifty_day_average) * 100
-    price_vs_200_day_avg = ((current_price - two_hundred_day_average)/two_hundred_day_average) * 100
-
-    return {
-        "rsi_14_day": rsi,
-        "price_vs_50_day_avg": f"{round(price_vs_50_day_avg, 2)}%",
-        "price_vs_200_day_avg": f"{round(price_vs_200_day_avg, 2)}%",
-        "beta": beta
-    }
+    return get_instrument_indicators([ticker], {ticker: summary_detail})[ticker]["sentiment"]
     
 
 def get_specific_instrument_rsi(prices, period=14):
     if len(prices) < period:
         return None
 
-    price_series = pd.Series(prices)
-
-    delta = price_series.diff(1)
-    up = delta.clip(lower=0)
-    down = -1 * delta.clip(upper=0)
-    
-    ema_up = up.ewm(com=period - 1, adjust=False).mean()
-    ema_down = down.ewm(com=period - 1, adjust=False).mean()
-    
-    rs = ema_up / ema_down
-    rsi = 100 - (100 / (1 + rs))
-    
-    return round(rsi.iloc[-1], 2)
-
+    return round(float(rsi(pd.DataFrame({"price": prices}), period)["price"].iloc[-1]), 2)
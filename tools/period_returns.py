@@ -0,0 +1,82 @@
+from tools.historical_pricing import get_historical_pricing
+from functions.history_store import period_start
+import numpy as np
+import pandas as pd
+
+RETURN_PERIODS = ["ytd", "1mo", "3mo", "1y", "3y", "5y", "10y"]
+
+
+def window_returns(closes: pd.Series, periods=RETURN_PERIODS, today=None) -> pd.DataFrame:
+    """
+    Returns in % of every symbol over every period, as a symbol x period frame, from a
+    close series indexed by (symbol, date). A window runs from the first trading day on
+    or after the period start to the latest close; it is NaN if the symbol has no
+    prices in it.
+
+    All windows of all symbols are resolved with one searchsorted over a combined
+    (symbol, day) key, so there is no per-symbol Python work.
+    """
+    closes = closes.dropna()
+
+    if closes.empty:
+        return pd.DataFrame(columns=periods, dtype=float)
+
+    index = closes.index
+    symbol_level = index.names.index("symbol")
+    date_level = index.names.index("date")
+
+    symbols = index.levels[symbol_level]
+    symbol_codes = index.codes[symbol_level].astype(np.int64)
+    days = index.levels[date_level].values.astype("datetime64[D]").astype(np.int64)[index.codes[date_level]]
+    values = closes.to_numpy(dtype=float)
+
+    first_day = days.min()
+    span = days.max() - first_day + 1
+    keys = symbol_codes * span + (days - first_day)
+
+    if not (keys[1:] >= keys[:-1]).all():
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        values = values[order]
+
+    # Each symbol owns the key range [code * span, (code + 1) * span).
+    symbol_starts = np.arange(len(symbols), dtype=np.int64) * span
+    begins = np.searchsorted(keys, symbol_starts)
+    ends = np.searchsorted(keys, symbol_starts + span)
+    present = ends > begins
+    last = values[np.maximum(ends - 1, 0)]
+
+    offsets = []
+    for period in periods:
+        start = period_start(period, today)
+        offsets.append(0 if start is None else np.datetime64(start, "D").astype(np.int64) - first_day)
+    offsets = np.clip(np.array(offsets, dtype=np.int64), 0, span)
+
+    targets = symbol_starts[:, None] + offsets[None, :]
+    first_rows = np.searchsorted(keys, targets)
+    has_prices = first_rows < ends[:, None]
+
+    first = values[np.minimum(first_rows, len(values) - 1)]
+    returns = np.where(has_prices, (last[:, None] - first) / first * 100, np.nan)
+
+    return pd.DataFrame(np.round(returns[present], 2), index=symbols[present], columns=periods)
+
+
+def get_period_returns(symbols, periods=RETURN_PERIODS):
+    """
+    Returns {symbol: {period: return in %}} for every period, computed from a single
+    daily history request covering the longest period. A symbol is left out of a
+    period it has no prices in.
+    """
+    if not symbols:
+        return {}
+
+    longest = min(periods, key=lambda period: period_start(period) or pd.Timestamp.min)
+    history = get_historical_pricing(list(symbols), period=longest, interval="1d")
+
+    returns = window_returns(history["close"], periods)
+
+    return {
+        symbol: {period: ret for period, ret in row.items() if not np.isnan(ret)}
+        for symbol, row in returns.to_dict(orient="index").items()
+    }
@@ -1,14 +1,14 @@
-from functions.holding_functions import HoldingsManager
-from currency_converter import CurrencyConverter
+from functions.holding_functions import get_holdings_manager
+from functions.portfolios import DEFAULT_PORTFOLIO_ID
 
-def get_sectors_in_portfolio():
-    manager = HoldingsManager()
-    holdings = manager.list_holdings()
+def get_sectors_in_portfolio(portfolio_id: str=DEFAULT_PORTFOLIO_ID):
+    manager = get_holdings_manager(portfolio_id)
+    positions = manager.list_positions()
 
     portfolio_sectors = []
 
-    for holding in holdings:
-        sector = holding["sector"]    
+    for position in positions:
+        sector = position["sector"]    
         if sector not in portfolio_sectors:
             portfolio_sectors.append(sector)
 
@@ -16,27 +16,29 @@ def get_sectors_in_portfolio():
 
 
 
-def get_industries_in_portfolio():
-    manager = HoldingsManager()
-    holdings = manager.list_holdings()
+def get_industries_in_portfolio(portfolio_id: str=DEFAULT_PORTFOLIO_ID):
+    manager = get_holdings_manager(portfolio_id)
+    positions = manager.list_positions()
 
     industries_in_portfolio = {}
 
-    for holding in holdings:
-        user_sector = holding["sector"]
-        user_industry = holding["industry"]
+    for position in positions:
+        user_sector = position["sector"]
+        user_industry = position["industry"]
         if user_sector not in industries_in_portfolio:
             industries_in_portfolio[user_sector] = []
         industries_in_portfolio[user_sector].append(user_industry)
 
     return industries_in_portfolio
 
-from functions.holding_functions import HoldingsManager
+from functions.holding_functions import get_holdings_manager
+from functions.columnar_snapshot import load_positions_frame
+from functions import fx
 from collections import defaultdict
 
 
 
-def get_portfolio_breakdown():
+def get_portfolio_breakdown(portfolio_id: str=DEFAULT_PORTFOLIO_ID):
     """
     Analyzes portfolio holdings to calculate the value-weighted percentage contribution
     of each sector to the total portfolio, and each industry within its sector.
@@ -46,11 +48,10 @@ def get_portfolio_breakdown():
               sector weights, and a breakdown of industry weights within each sector.
               Returns an empty structure if there are no holdings.
     """
-    manager = HoldingsManager()
-    holdings = manager.list_holdings()
-    c = CurrencyConverter()
+    manager = get_holdings_manager(portfolio_id)
+    positions = load_positions_frame(manager)
 
-    if not holdings:
+    if positions.empty:
         return {
             "total_portfolio_value": 0,
             "sector_weights": {},
@@ -61,14 +62,15 @@ def get_portfolio_breakdown():
     industry_values = defaultdict(lambda: defaultdict(float))
     total_portfolio_value = 0.0
 
-    for holding in holdings:
-        currency = holding.get("currency", "USD")
-        price = c.convert(holding.get("price", 0) or 0, currency, "USD")
-        quantity = holding.get("quantity", 0) or 0
-        
-        holding_value = price * quantity
-        sector = holding.get("sector", "unknown")
-        industry = holding.get("industry", "unknown")
+    holding_values = fx.convert(
+        positions["total_cost"].fillna(0),
+        positions["currency"].astype(object).fillna("USD"),
+        "USD"
+    )
+
+    for holding_value, sector, industry in zip(holding_values, positions["sector"], positions["industry"]):
+        sector = sector if isinstance(sector, str) else "unknown"
+        industry = industry if isinstance(industry, str) else "unknown"
 
         total_portfolio_value += holding_value
         sector_values[sector] += holding_value
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from yahooquery import Ticker
+from tools.financials import QUOTE_BATCH_SIZE
+from functions.request_governor import yahoo_batch_request
+
+# How long a fetched quote is served from the cache, in seconds.
+QUOTE_CACHE_TTL = float(os.getenv("QUOTE_CACHE_TTL", "60"))
+
+
+def _fetch_price_modules(symbols) -> Dict[str, dict]:
+    """The yahooquery price module for many symbols, one request per QUOTE_BATCH_SIZE symbols."""
+    prices = {}
+
+    for i in range(0, len(symbols), QUOTE_BATCH_SIZE):
+        batch = symbols[i:i + QUOTE_BATCH_SIZE]
+        response = yahoo_batch_request("quote", batch, lambda pending: Ticker(pending, asynchronous=True).price)
+        if not isinstance(response, dict):
+            continue
+
+        for symbol in batch:
+            # Unknown symbols come back as an error string instead of a dict.
+            if isinstance(response.get(symbol), dict):
+                prices[symbol] = response[symbol]
+
+    return prices
+
+
+class QuoteCache:
+    """
+    Current quotes (the yahooquery price module) keyed by symbol, kept for ttl seconds.
+
+    A lookup serves fresh symbols from the cache and requests all of its misses
+    together. A symbol another thread is already fetching is not requested again;
+    the lookup waits for that fetch instead.
+    """
+    def __init__(self, ttl: float=QUOTE_CACHE_TTL, fetch=_fetch_price_modules):
+        self.ttl = ttl
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._quotes: Dict[str, tuple] = {}
+        self._in_flight: Dict[str, threading.Event] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.requests = 0
+
+
+
+    def get_quotes(self, symbols: Iterable[str]) -> Dict[str, dict]:
+        """{symbol: price module} for every symbol Yahoo has a quote for."""
+        symbols = list(dict.fromkeys(symbols))
+        quotes = {}
+        to_fetch = []
+        pending = {}
+
+        with self._lock:
+            now = time.monotonic()
+            for symbol in symbols:
+                cached = self._quotes.get(symbol)
+                if cached and now - cached[0] < self.ttl:
+                    quotes[symbol] = cached[1]
+                    self.hits += 1
+                elif symbol in self._in_flight:
+                    pending[symbol] = self._in_flight[symbol]
+                    self.coalesced += 1
+                else:
+                    self._in_flight[symbol] = threading.Event()
+                    to_fetch.append(symbol)
+                    self.misses += 1
+
+            if to_fetch:
+                self.requests += 1
+
+        if to_fetch:
+            fetched = {}
+            try:
+                fetched = self._fetch(to_fetch)
+            finally:
+                with self._lock:
+                    fetched_at = time.monotonic()
+                    for symbol in to_fetch:
+                        if symbol in fetched:
+                            self._quotes[symbol] = (fetched_at, fetched[symbol])
+                        self._in_flight.pop(symbol).set()
+            quotes.update(fetched)
+
+        for symbol, done in pending.items():
+            done.wait()
+            with self._lock:
+                cached = self._quotes.get(symbol)
+            if cached:
+                quotes[symbol] = cached[1]
+
+        return quotes
+
+
+
+    def get_quote(self, symbol: str) -> Optional[dict]:
+        return self.get_quotes([symbol]).get(symbol)
+
+
+
+    def remember(self, quotes: Dict[str, dict]):
+        """Stores quotes fetched elsewhere (e.g. the price module of a get_modules call)."""
+        with self._lock:
+            fetched_at = time.monotonic()
+            for symbol, quote in quotes.items():
+                if isinstance(quote, dict) and quote:
+                    self._quotes[symbol] = (fetched_at, quote)
+
+
+
+    def clear(self):
+        with self._lock:
+            self._quotes.clear()
+
+
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "requests": self.requests,
+                "cached": len(self._quotes)
+            }
+
+
+# Shared by every tool so one user turn asks Yahoo for a quote at most once.
+quote_cache = QuoteCache()
+
+
+def get_quotes(symbols) -> Dict[str, dict]:
+    return quote_cache.get_quotes(symbols)
+
+
+def get_current_price(symbol: str) -> Optional[float]:
+    return (quote_cache.get_quote(symbol) or {}).get("regularMarketPrice")
@@ -0,0 +1,182 @@
+import os
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from functions.history_store import HistoryStore, HISTORY_DIR, read_parquet, write_parquet
+
+# Every indicator below works on a date x symbol matrix (one column per symbol) and
+# returns a matrix of the same shape, computed for all columns at once.
+#
+# Symbols listed on different exchanges have different holidays, so a column can have
+# NaN rows where other symbols traded. Windowed indicators are computed over each
+# symbol's own bars (a 14-day RSI spans 14 of its bars, not 14 rows of the matrix):
+# the bars of every column are packed to the top, the indicator runs on the packed
+# matrix, and the results are put back on their original dates.
+
+
+def price_matrix(history: pd.DataFrame, field: str="close") -> pd.DataFrame:
+    """A date x symbol matrix of one field of a (symbol, date) indexed history frame."""
+    return history[field].unstack("symbol").sort_index()
+
+
+def _packed_order(matrix: pd.DataFrame) -> np.ndarray:
+    """Per column, the row order that moves that column's bars to the top, in date order."""
+    return np.argsort(matrix.isna().to_numpy(), axis=0, kind="stable")
+
+
+def _by_bar(indicator, *matrices: pd.DataFrame, order: np.ndarray=None) -> pd.DataFrame:
+    """
+    Runs indicator(*packed_matrices) on matrices whose bars have been packed to the top of
+    each column, and returns its result on the original dates (NaN where there was no bar).
+    """
+    order = _packed_order(matrices[0]) if order is None else order
+    packed = [
+        pd.DataFrame(np.take_along_axis(m.to_numpy(dtype=float), order, axis=0), columns=m.columns)
+        for m in matrices
+    ]
+
+    result = indicator(*packed).to_numpy(dtype=float)
+    unpacked = np.empty_like(result)
+    np.put_along_axis(unpacked, order, result, axis=0)
+    unpacked[matrices[0].isna().to_numpy()] = np.nan
+
+    return pd.DataFrame(unpacked, index=matrices[0].index, columns=matrices[0].columns)
+
+
+def moving_average(closes: pd.DataFrame, window: int) -> pd.DataFrame:
+    return _by_bar(lambda c: c.rolling(window, min_periods=window).mean(), closes)
+
+
+def exponential_average(closes: pd.DataFrame, span: int) -> pd.DataFrame:
+    return _by_bar(lambda c: c.ewm(span=span, adjust=False).mean(), closes)
+
+
+def rsi(closes: pd.DataFrame, period: int=14) -> pd.DataFrame:
+    """Wilder's RSI; NaN until a symbol has period bars."""
+    def indicator(c):
+        delta = c.diff(1)
+        ema_up = delta.clip(lower=0).ewm(com=period - 1, adjust=False).mean()
+        ema_down = (-delta.clip(upper=0)).ewm(com=period - 1, adjust=False).mean()
+        values = 100 - (100 / (1 + ema_up / ema_down))
+        # Bar numbers within each column, to blank out the first period - 1 bars.
+        return values.where(c.notna().cumsum() >= period)
+
+    return _by_bar(indicator, closes)
+
+
+def macd(closes: pd.DataFrame, fast: int=12, slow: int=26, signal: int=9) -> Dict[str, pd.DataFrame]:
+    """{"macd", "signal", "histogram"} matrices."""
+    order = _packed_order(closes)
+    macd_line = _by_bar(lambda c: c.ewm(span=fast, adjust=False).mean() - c.ewm(span=slow, adjust=False).mean(), closes, order=order)
+    signal_line = _by_bar(lambda m: m.ewm(span=signal, adjust=False).mean(), macd_line, order=order)
+
+    return {"macd": macd_line, "signal": signal_line, "histogram": macd_line - signal_line}
+
+
+def bollinger_bands(closes: pd.DataFrame, window: int=20, num_std: float=2.0) -> Dict[str, pd.DataFrame]:
+    """{"middle", "upper", "lower", "percent_b"} matrices; percent_b is 0 at the lower and 1 at the upper band."""
+    order = _packed_order(closes)
+    middle = _by_bar(lambda c: c.rolling(window, min_periods=window).mean(), closes, order=order)
+    std = _by_bar(lambda c: c.rolling(window, min_periods=window).std(ddof=0), closes, order=order)
+
+    upper = middle + num_std * std
+    lower = middle - num_std * std
+    return {"middle": middle, "upper": upper, "lower": lower, "percent_b": (closes - lower) / (upper - lower)}
+
+
+def atr(highs: pd.DataFrame, lows: pd.DataFrame, closes: pd.DataFrame, period: int=14) -> pd.DataFrame:
+    """Wilder's average true range; the three matrices must share index and columns."""
+    def indicator(h, l, c):
+        previous_close = c.shift(1)
+        true_range = np.maximum(h - l, np.maximum((h - previous_close).abs(), (l - previous_close).abs()))
+        true_range = true_range.where(previous_close.notna(), h - l)
+        values = true_range.ewm(alpha=1 / period, adjust=False).mean()
+        return values.where(c.notna().cumsum() >= period)
+
+    return _by_bar(indicator, highs, lows, closes)
+
+
+def realized_volatility(closes: pd.DataFrame, window: int=252) -> pd.DataFrame:
+    """Annualized standard deviation of daily log returns over the last window bars, in %."""
+    return _by_bar(lambda c: np.log(c).diff().rolling(window, min_periods=2).std() * np.sqrt(252) * 100, closes)
+
+
+def drawdown(closes: pd.DataFrame) -> pd.DataFrame:
+    """Percentage below the highest close so far (0 at a new high, negative otherwise)."""
+    return (closes / closes.cummax() - 1) * 100
+
+
+def latest(matrix: pd.DataFrame) -> pd.Series:
+    """The last value of every column, from that symbol's own last bar."""
+    return matrix.ffill().iloc[-1] if len(matrix) else pd.Series(dtype=float, index=matrix.columns)
+
+
+def indicator_snapshot(history: pd.DataFrame) -> pd.DataFrame:
+    """
+    Latest value of every indicator for every symbol in a (symbol, date) indexed history
+    frame, as a symbol indexed frame. as_of is the date of the symbol's last bar.
+    """
+    closes = price_matrix(history, "close")
+    highs = price_matrix(history, "high").reindex_like(closes)
+    lows = price_matrix(history, "low").reindex_like(closes)
+
+    macd_lines = macd(closes)
+    bands = bollinger_bands(closes)
+    drawdowns = drawdown(closes)
+
+    snapshot = pd.DataFrame({
+        "as_of": closes.apply(pd.Series.last_valid_index),
+        "close": latest(closes),
+        "ma_50": latest(moving_average(closes, 50)),
+        "ma_200": latest(moving_average(closes, 200)),
+        "rsi_14": latest(rsi(closes)),
+        "macd": latest(macd_lines["macd"]),
+        "macd_signal": latest(macd_lines["signal"]),
+        "macd_histogram": latest(macd_lines["histogram"]),
+        "bollinger_upper": latest(bands["upper"]),
+        "bollinger_lower": latest(bands["lower"]),
+        "bollinger_percent_b": latest(bands["percent_b"]),
+        "atr_14": latest(atr(highs, lows, closes)),
+        "realized_volatility_1y": latest(realized_volatility(closes)),
+        "drawdown": latest(drawdowns),
+        "max_drawdown": drawdowns.min()
+    })
+    snapshot.index.name = "symbol"
+    return snapshot
+
+
+def get_indicator_snapshot(symbols, period: str="1y", interval: str="1d", directory: str=HISTORY_DIR) -> pd.DataFrame:
+    """
+    indicator_snapshot of symbols over period, from the history store. Snapshots are kept
+    next to the stored bars (Database/history/<interval>/indicators_<period>.parquet) and
+    a symbol is only recomputed once its last bar is newer than (or differs from) its snapshot.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    history = HistoryStore(interval, directory).get(symbols, period)
+    if history.empty:
+        return pd.DataFrame(index=pd.Index([], name="symbol"))
+
+    last_bars = history["close"].dropna().reset_index().groupby("symbol").last()
+
+    path = os.path.join(directory, interval, f"indicators_{period}.parquet")
+    cached, _ = read_parquet(path)
+    cached = cached.set_index("symbol") if cached is not None else pd.DataFrame(columns=["as_of", "close"])
+
+    # The last bar can still be today's live one, so its close has to match as well.
+    up_to_date = [
+        symbol for symbol, last_bar in last_bars.iterrows()
+        if symbol in cached.index
+        and pd.Timestamp(cached.at[symbol, "as_of"]) == pd.Timestamp(last_bar["date"])
+        and cached.at[symbol, "close"] == last_bar["close"]
+    ]
+    outdated = [symbol for symbol in last_bars.index if symbol not in up_to_date]
+
+    if outdated:
+        computed = indicator_snapshot(history[history.index.get_level_values("symbol").isin(outdated)])
+        cached = pd.concat([cached.drop(index=outdated, errors="ignore"), computed])
+        cached.index.name = "symbol"
+        write_parquet(cached, path, {"period": period, "interval": interval})
+
+    return cached.reindex([symbol for symbol in symbols if symbol in last_bars.index])
@@ -2,14 +2,50 @@ import yahooquery as yq
 from rich.console import Console
 from rich.table import Table
 from rich.prompt import Prompt, IntPrompt, Confirm
+from functions.symbol_index import get_symbol_index
+from functions.request_governor import yahoo_request
+from tools.financials import get_quote_records
 
 def get_ticker(company_name):
     """
     Takes a company name (e.g., 'Apple') and returns its stock ticker symbol (e.g., 'AAPL').
+    Names already known to the local symbol index are answered without a network search.
     """
-    data = yq.search(company_name, first_quote=False, news_count=0, quotes_count=15)
+    index = get_symbol_index()
 
-    return data.get("quotes", [])
+    quotes = index.lookup(company_name)
+    if quotes is not None:
+        return quotes
+
+    return search_ticker(company_name)
+
+
+def search_ticker(company_name):
+    """Searches Yahoo Finance for company_name, bypassing the local symbol index, and stores the results in it."""
+    data = yahoo_request("search", yq.search, company_name, first_quote=False, news_count=0, quotes_count=15)
+    quotes = data.get("quotes", []) if isinstance(data, dict) else []
+
+    if quotes:
+        get_symbol_index().remember(company_name, quotes)
+    return quotes
+
+
+def refresh_symbol_index(symbols=None):
+    """Re-fetches names, exchange and quote type of the given (default: all) indexed symbols in bulk."""
+    index = get_symbol_index()
+    records = get_quote_records(symbols or index.symbols())
+
+    index.add_quotes([
+        {
+            "symbol": symbol,
+            "longname": record["long_name"],
+            "shortname": record["short_name"],
+            "exchange": record["exchange"],
+            "quoteType": record["quote_type"]
+        }
+        for symbol, record in records.items()
+    ])
+    return len(records)
 
 
 def get_tickers(companies):
@@ -34,45 +70,70 @@ def get_tickers(companies):
                     return {}
                 continue
 
-        table = Table(title=f"Found Tickers for [bold cyan]{company}[/bold cyan]", show_header=True, header_style="bold magenta")
-        table.add_column("Option #", style="dim", width=10, justify="center")
-        table.add_column("Name", style="cyan")
-        table.add_column("Symbol", style="green")
-        table.add_column("Exchange", style="yellow")
-        table.add_column("Type", style="blue")
-
-        for i, stock in enumerate(stock_list, 1):
-            name = stock.get("longname") or stock.get("shortname", "N/A")
-            symbol = stock.get("symbol", "N/A")
-            exchange = stock.get("exchDisp", "N/A")
-            quote_type = stock.get("quoteType", "N/A")
-            table.add_row(str(i), name, symbol, exchange, quote_type)
-
-        console.print(table)
-
-        if(len(stock_list) > 1):
-            chosen_index = IntPrompt.ask(
-                "Please enter the number of the stock",
-                choices=[str(i) for i in range(1, len(stock_list) + 1)],
-                show_choices=False
-            )
-
-            selected_symbol = stock_list[chosen_index - 1]["symbol"]
-            tickers[company] = selected_symbol
-        else:
-            choice = Confirm.ask(
-                "Is this the stock you want to analyze? (Y/N)",
-                choices=["y", "n", "Y", "N"],
-                show_choices=False
-            )
-
-            if (choice == True):
-                selected_symbol = stock_list[0]["symbol"]
-                tickers[company] = selected_symbol
+        # Only the results of an earlier Yahoo search for this exact name are complete; a fuzzy
+        # or holdings-seeded local match may miss listings, so rejecting it searches Yahoo.
+        can_search = not get_symbol_index().searched(company)
+
+        while True:
+            table = Table(title=f"Found Tickers for [bold cyan]{company}[/bold cyan]", show_header=True, header_style="bold magenta")
+            table.add_column("Option #", style="dim", width=10, justify="center")
+            table.add_column("Name", style="cyan")
+            table.add_column("Symbol", style="green")
+            table.add_column("Exchange", style="yellow")
+            table.add_column("Type", style="blue")
+
+            for i, stock in enumerate(stock_list, 1):
+                name = stock.get("longname") or stock.get("shortname", "N/A")
+                symbol = stock.get("symbol", "N/A")
+                exchange = stock.get("exchDisp", "N/A")
+                quote_type = stock.get("quoteType", "N/A")
+                table.add_row(str(i), name, symbol, exchange, quote_type)
+
+            console.print(table)
+
+            if(len(stock_list) > 1):
+                choices = [str(i) for i in range(1, len(stock_list) + 1)]
+                if can_search:
+                    console.print("[dim]Enter 0 to search Yahoo Finance for other listings.[/dim]")
+                    choices.append("0")
+
+                chosen_index = IntPrompt.ask(
+                    "Please enter the number of the stock",
+                    choices=choices,
+                    show_choices=False
+                )
+
+                if chosen_index > 0:
+                    selected_symbol = stock_list[chosen_index - 1]["symbol"]
+                    break
             else:
-                console.print("[bold yellow]User cancelled operation![/bold yellow]")
+                choice = Confirm.ask(
+                    "Is this the stock you want to analyze? (Y/N)",
+                    choices=["y", "n", "Y", "N"],
+                    show_choices=False
+                )
+
+                if (choice == True):
+                    selected_symbol = stock_list[0]["symbol"]
+                    break
+                if not can_search:
+                    console.print("[bold yellow]User cancelled operation![/bold yellow]")
+                    return {}
+
+            console.print("Searching Yahoo Finance...", style="dim italic")
+            stock_list = search_ticker(company)
+            can_search = False
+
+            if not stock_list:
+                console.print(f"[bold red]No other listings found for '{company}'![/bold red]")
                 return {}
-            
+
+        tickers[company] = selected_symbol
         console.print(f"You selected: [bold green]{selected_symbol}[/bold green]\n")
 
     return tickers
+
+
+if __name__ == "__main__":
+    count = refresh_symbol_index()
+    print(f"Refreshed {count} symbols in the local symbol index")